@@ -2,9 +2,9 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import time
+from array import array
 from abc import ABC, abstractmethod
 from typing import Any, TypeVar
 
@@ -12,28 +12,39 @@ from .config import INSERTION_SENTINEL
 
 logger = logging.getLogger(__name__)
 
-Record = tuple[str, str, str, bool]
+Record = tuple[str, str, tuple, bool, str]  # (pid, msg_type, row, is_original, mrn)
 Batch = list[Record]
 Conn = TypeVar("Conn")
 
+# Insert tallies are kept on the worker instance (shared by all its run() tasks) and folded into inserted_shared
+# every N batches or this often (progress lag is acceptable).
+STATS_FLUSH_BATCHES = 16
+STATS_FLUSH_INTERVAL_SEC = 1.0
 
 def _mrns_from_batch(batch: Batch) -> list[str]:
-    """Extract MEDICAL_RECORD_NUMBER from each record in the batch. Skips invalid/empty; logs and continues."""
-    mrns: list[str] = []
-    for record in batch:
-        json_str = record[2]
-        try:
-            mrn = json.loads(json_str).get("MEDICAL_RECORD_NUMBER")
-        except (json.JSONDecodeError, KeyError, TypeError):
-            logger.error("Query queue: could not get MEDICAL_RECORD_NUMBER from record, skipping")
-            continue
-        if mrn:
-            mrns.append(mrn)
-        else:
-            logger.error("Query queue: MEDICAL_RECORD_NUMBER is empty, skipping")
+    """MEDICAL_RECORD_NUMBER of each record in the batch (attached by the producer at record[4]).
+    Skips empty values; logs one summary line per batch."""
+    mrns = [record[4] for record in batch if record[4]]
+    bad_mrn = len(batch) - len(mrns)
+    if bad_mrn and logger.isEnabledFor(logging.ERROR):
+        logger.error(
+            "Query queue: skipped %d record(s) with empty MEDICAL_RECORD_NUMBER (batch of %d)",
+            bad_mrn, len(batch),
+        )
     return mrns
 
 
+async def _put_many(q: asyncio.Queue[Any], items: list[Any]) -> None:
+    """Enqueue items with put_nowait while there is room; only await put() (and yield) once the queue is full."""
+    for i, item in enumerate(items):
+        try:
+            q.put_nowait(item)
+        except asyncio.QueueFull:
+            for rest in items[i:]:
+                await q.put(rest)
+            return
+
+
 def _split_originals_duplicates(batch: Batch) -> tuple[Batch, Batch]:
     """Split batch into originals and duplicates (match Go InsertPair)."""
     originals: Batch = []
@@ -47,23 +58,42 @@ def _split_originals_duplicates(batch: Batch) -> tuple[Batch, Batch]:
 
 
 class BaseAsyncInsertWorker(ABC):
-    """Async base: consume full batches from asyncio.Queue; insert originals then duplicates."""
+    """Async base: consume full batches from asyncio.Queue; insert originals then duplicates.
+
+    inserted_shared is updated without a lock: all workers run on one event loop thread and
+    each read-modify-write has no await in between, so it cannot interleave with another task.
+
+    When pin_connection is set, each run() task holds one connection for its lifetime instead of
+    taking one from the pool around every batch.
+    """
+
+    pin_connection = False
 
     def __init__(
         self,
         insertion_queue: asyncio.Queue[tuple[str, Batch] | None],
         query_queue: asyncio.Queue[Any],
-        inserted_lock: asyncio.Lock,
-        inserted_shared: list[float],
+        inserted_shared: array,
         batch_size: int,
         queries_per_record: int = 1,
     ) -> None:
         self.insertion_queue = insertion_queue
         self.query_queue = query_queue
-        self.inserted_lock = inserted_lock
         self.inserted_shared = inserted_shared
         self.batch_size = batch_size
         self.queries_per_record = queries_per_record
+        self._init_worker_state()
+
+    def _init_worker_state(self) -> None:
+        """Worker-instance state every backend needs; subclasses that do not call __init__ must call this."""
+        self._reset_local_stats()
+        self.fused_queries = False
+
+    def _reset_local_stats(self) -> None:
+        # Local [total, originals, duplicates, latency_sec, statements]; see _add_insert_stats.
+        self._local_stats = [0, 0, 0, 0.0, 0]
+        self._local_batches = 0
+        self._local_flushed_at = time.monotonic()
 
     @abstractmethod
     async def get_connection(self) -> Any:
@@ -74,60 +104,126 @@ class BaseAsyncInsertWorker(ABC):
         ...
 
     @abstractmethod
-    async def insert_batch(self, conn: Any, batch: list[tuple[str, str, str]], query_hint: str = "") -> tuple[int, int]:
-        """Insert batch. Returns (rows_inserted, statement_count). query_hint is the prepared hint string set by the producer."""
+    async def insert_batch(self, conn: Any, batch: Batch, query_hint: str = "") -> tuple[int, int]:
+        """Insert batch of producer records (backends read only the row at r[2]). Returns (rows_inserted, statement_count).
+        query_hint is the prepared hint string set by the producer."""
         ...
 
-    async def _flush(self, batch: Batch, query_hint: str = "") -> None:
+    @abstractmethod
+    async def query_by_primary_key(self, conn: Any, mrn: str) -> list:
+        """Rows matching MEDICAL_RECORD_NUMBER mrn on conn (fused mode)."""
+        ...
+
+    def enable_fused_queries(
+        self,
+        queries_shared: array,
+        query_rate_limiter: Any,
+        ignore_select_errors: bool,
+    ) -> None:
+        """Run the primary-key queries for each batch inline after its INSERT instead of via query_queue."""
+        self.fused_queries = True
+        self.queries_shared = queries_shared
+        self.query_rate_limiter = query_rate_limiter
+        self.ignore_select_errors = ignore_select_errors
+
+    async def _query_inline(self, conn: Any, mrns: list[str]) -> None:
+        """Fused mode: queries_per_record lookups per MRN on conn; updates queries_shared like the query workers."""
+        total_latency_sec = 0.0
+        failed = 0
+        for mrn in mrns:
+            for _ in range(self.queries_per_record):
+                if self.query_rate_limiter is not None:
+                    await self.query_rate_limiter.acquire()
+                t0 = time.perf_counter()
+                rows = await self.query_by_primary_key(conn, mrn)
+                total_latency_sec += time.perf_counter() - t0
+                if len(rows) != 1:
+                    failed += 1
+                    if not self.ignore_select_errors:
+                        logger.error(
+                            "Query by primary key returned %d rows for MEDICAL_RECORD_NUMBER=%s (expected 1)",
+                            len(rows), mrn,
+                        )
+        self.queries_shared[0] += len(mrns) * self.queries_per_record
+        self.queries_shared[1] += total_latency_sec
+        self.queries_shared[2] += failed
+
+    def _add_insert_stats(
+        self, rows: int, originals: int, duplicates: int, latency_sec: float, statements: int
+    ) -> None:
+        """Accumulate insert counters locally; fold into inserted_shared every STATS_FLUSH_BATCHES or STATS_FLUSH_INTERVAL_SEC."""
+        local = self._local_stats
+        local[0] += rows
+        local[1] += originals
+        local[2] += duplicates
+        local[3] += latency_sec
+        local[4] += statements
+        self._local_batches += 1
+        if (
+            self._local_batches >= STATS_FLUSH_BATCHES
+            or time.monotonic() - self._local_flushed_at >= STATS_FLUSH_INTERVAL_SEC
+        ):
+            self._flush_stats()
+
+    def _flush_stats(self) -> None:
+        """Add local insert counters to inserted_shared and reset them."""
+        local = self._local_stats
+        self._reset_local_stats()
+        shared = self.inserted_shared
+        for i, v in enumerate(local):
+            shared[i] += v
+
+    async def _flush(self, batch: Batch, query_hint: str = "", conn: Any = None) -> None:
+        """Insert one batch. conn is the run() task's pinned connection, if any; otherwise one is taken from the pool."""
         if not batch:
             return
         originals, duplicates = _split_originals_duplicates(batch)
-        async with self.inserted_lock:
-            self.inserted_shared[5] += 1
-        conn = await self.get_connection()
+        self.inserted_shared[5] += 1
+        pooled = conn is None
+        if pooled:
+            conn = await self.get_connection()
         try:
             total_rows = 0
             total_latency_sec = 0.0
             n_statements = 0
             if originals:
-                rows_db = [(r[0], r[1], r[2]) for r in originals]
                 t0 = time.perf_counter()
-                n, stmts = await self.insert_batch(conn, rows_db, query_hint)
+                n, stmts = await self.insert_batch(conn, originals, query_hint)
                 total_rows += n
                 total_latency_sec += time.perf_counter() - t0
                 n_statements += stmts
             if duplicates:
-                rows_db = [(r[0], r[1], r[2]) for r in duplicates]
                 t0 = time.perf_counter()
-                n, stmts = await self.insert_batch(conn, rows_db, query_hint)
+                n, stmts = await self.insert_batch(conn, duplicates, query_hint)
                 total_rows += n
                 total_latency_sec += time.perf_counter() - t0
                 n_statements += stmts
-            n_originals = len(originals)
-            n_duplicates = len(duplicates)
-            async with self.inserted_lock:
-                self.inserted_shared[0] += total_rows
-                self.inserted_shared[1] += n_originals
-                self.inserted_shared[2] += n_duplicates
-                self.inserted_shared[3] += total_latency_sec
-                self.inserted_shared[4] += n_statements
+            self._add_insert_stats(
+                total_rows, len(originals), len(duplicates), total_latency_sec, n_statements
+            )
             if self.queries_per_record > 0:
-                insert_time = time.time()
-                for mrn in _mrns_from_batch(batch):
-                    await self.query_queue.put((mrn, insert_time))
+                if self.fused_queries:
+                    await self._query_inline(conn, _mrns_from_batch(batch))
+                else:
+                    insert_time_ns = time.monotonic_ns()
+                    await _put_many(self.query_queue, [(mrn, insert_time_ns) for mrn in _mrns_from_batch(batch)])
         finally:
-            async with self.inserted_lock:
-                self.inserted_shared[5] -= 1
-                if self.inserted_shared[5] < 0:
-                    self.inserted_shared[5] = 0
-            await self.release_connection(conn)
+            self.inserted_shared[5] = max(0, self.inserted_shared[5] - 1)
+            if pooled:
+                await self.release_connection(conn)
 
     async def run(self) -> None:
-        while True:
-            item = await self.insertion_queue.get()
-            if item is INSERTION_SENTINEL:
-                return
-            query_hint, batch = item
-            async with self.inserted_lock:
+        conn = await self.get_connection() if self.pin_connection else None
+        try:
+            while True:
+                item = await self.insertion_queue.get()
+                if item is INSERTION_SENTINEL:
+                    return
+                query_hint, batch = item
                 self.inserted_shared[6] += 1
-            await self._flush(batch, query_hint)
+                await self._flush(batch, query_hint, conn)
+        finally:
+            # Also on error or cancellation, so counts already taken are not lost from progress and the summary.
+            self._flush_stats()
+            if conn is not None:
+                await self.release_connection(conn)
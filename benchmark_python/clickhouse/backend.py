@@ -1,55 +1,57 @@
 """ClickHouse backend (asynch): pool, schema init, batch insert, query."""
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
-from datetime import datetime, timezone
 from typing import Any
 
 from asynch import Connection
 
 from ..config import (
     CLICKHOUSE_CLUSTER,
+    CLICKHOUSE_COMPRESSION,
     CLICKHOUSE_STORAGE_POLICY,
     DB_NAME,
     PASSWORD,
     USER,
 )
+from ..patient_generator import ROW_KEYS
 
 logger = logging.getLogger(__name__)
 
-_HL7_COLUMNS = (
-    "FHIR_ID", "RX_PATIENT_ID", "SOURCE", "CDC", "CREATED_AT", "CREATED_BY",
-    "UPDATED_AT", "UPDATED_BY", "LOAD_DATE", "CHECKSUM", "PATIENT_ID",
-    "MEDICAL_RECORD_NUMBER", "NAME_PREFIX", "LAST_NAME", "FIRST_NAME", "NAME_SUFFIX",
-    "DATE_OF_BIRTH", "GENDER_ADMINISTRATIVE", "FHIR_GENDER_ADMINISTRATIVE",
-    "GENDER_IDENTITY", "FHIR_GENDER_IDENTITY", "MARITAL_STATUS", "FHIR_MARITAL_STATUS",
-    "RACE_DISPLAY", "FHIR_RACE_DISPLAY", "ETHNICITY_DISPLAY", "FHIR_ETHNICITY_DISPLAY",
-    "SEX_AT_BIRTH", "IS_PREGNANT",
-)
+# Column names in producer row order (patient_generator.ROW_KEYS).
+_HL7_COLUMNS = ROW_KEYS
 
 
 async def create_pool(host: str, port: int, size: int) -> list[Connection]:
-    """Create a list of asynch connections (use as a pool via queue)."""
-    connections: list[Connection] = []
-    for _ in range(size):
-        conn = Connection(
+    """Create a list of asynch connections (use as a pool via queue). CLICKHOUSE_COMPRESSION enables block compression.
+    Connections are opened concurrently, so setup takes about one connect time rather than size of them."""
+    if CLICKHOUSE_COMPRESSION:
+        logger.info("ClickHouse connections use %s block compression", CLICKHOUSE_COMPRESSION)
+    connections: list[Connection] = [
+        Connection(
             host=host,
             port=port,
             user=USER,
             password=PASSWORD,
             database=DB_NAME,
+            compression=CLICKHOUSE_COMPRESSION,
         )
-        await conn.connect()
-        connections.append(conn)
+        for _ in range(size)
+    ]
+    await asyncio.gather(*(conn.connect() for conn in connections))
+    _protocol_execute(connections[0])  # fail at setup, not on the first insert, if the driver lacks it
     return connections
 
 
 async def prewarm_pool(connections: list[Connection]) -> None:
-    """Prewarm by executing a no-op on each connection."""
-    for conn in connections:
+    """Prewarm by executing a no-op on each connection (all connections at once)."""
+
+    async def ping(conn: Connection) -> None:
         async with conn.cursor() as cursor:
             await cursor.execute("SELECT 1")
+
+    await asyncio.gather(*(ping(conn) for conn in connections))
     logger.info("Prewarmed ClickHouse pool (%d connections)", len(connections))
 
 
@@ -137,61 +139,45 @@ async def init_schema(conn: Connection) -> None:
     logger.info("Cluster tables hl7_messages created (ClickHouse)")
 
 
-def _row_from_producer_tuple(t: tuple[str, str, str]) -> tuple:
-    """Convert (patient_id, message_type, json_message) to a row tuple matching hl7_messages schema."""
-    _pid, _msg_type, json_str = t
-    d = json.loads(json_str)
-    now = datetime.now(timezone.utc).replace(tzinfo=None)
-    return (
-        d.get("FHIR_ID"),
-        d.get("RX_PATIENT_ID"),
-        d.get("SOURCE"),
-        d.get("CDC"),
-        d.get("CREATED_AT") or now,
-        d.get("CREATED_BY"),
-        d.get("UPDATED_AT") or now,
-        d.get("UPDATED_BY"),
-        d.get("LOAD_DATE"),
-        d.get("CHECKSUM"),
-        d.get("PATIENT_ID"),
-        d.get("MEDICAL_RECORD_NUMBER"),
-        d.get("NAME_PREFIX"),
-        d.get("LAST_NAME"),
-        d.get("FIRST_NAME"),
-        d.get("NAME_SUFFIX"),
-        d.get("DATE_OF_BIRTH"),
-        d.get("GENDER_ADMINISTRATIVE"),
-        d.get("FHIR_GENDER_ADMINISTRATIVE"),
-        d.get("GENDER_IDENTITY"),
-        d.get("FHIR_GENDER_IDENTITY"),
-        d.get("MARITAL_STATUS"),
-        d.get("FHIR_MARITAL_STATUS"),
-        d.get("RACE_DISPLAY"),
-        d.get("FHIR_RACE_DISPLAY"),
-        d.get("ETHNICITY_DISPLAY"),
-        d.get("FHIR_ETHNICITY_DISPLAY"),
-        d.get("SEX_AT_BIRTH"),
-        d.get("IS_PREGNANT"),
+_INSERT_SQL = f"INSERT INTO {DB_NAME}.hl7_messages ({', '.join(_HL7_COLUMNS)}) VALUES"
+_INSERT_SETTINGS = {
+    "insert_quorum": 2,
+    "insert_quorum_parallel": 1,
+    "distributed_foreground_insert": 1,
+    "async_insert": 0,
+}
+
+
+def _protocol_execute(conn: Connection) -> Any:
+    """The protocol client's execute behind Connection._connection: the one place that reaches into asynch privates.
+
+    asynch's public Cursor.execute/executemany do not forward columnar=, so columnar inserts need it (present in
+    asynch 0.3-0.4, the range pinned in requirements.txt). Raises rather than falling back to row-oriented inserts,
+    which would silently change the insert path and break comparison with earlier runs."""
+    execute = getattr(getattr(conn, "_connection", None), "execute", None)
+    if execute is None:
+        raise RuntimeError(
+            "asynch Connection has no _connection.execute; columnar inserts need asynch>=0.3,<0.5"
+        )
+    return execute
+
+
+async def _execute_columnar_insert(conn: Connection, rows: list[tuple]) -> None:
+    """Send rows as one column-oriented block, so the driver writes each column directly instead of transposing rows."""
+    await _protocol_execute(conn)(
+        _INSERT_SQL,
+        list(zip(*rows)),
+        settings=dict(_INSERT_SETTINGS),
+        types_check=False,
+        columnar=True,
     )
 
 
-async def insert_batch(conn: Connection, rows: list[tuple[str, str, str]]) -> int:
-    """Insert batch of (patient_id, message_type, json_message) by mapping to hl7_messages columns."""
+async def insert_batch(conn: Connection, rows: list[tuple]) -> int:
+    """Insert batch of producer records (row tuple at r[2]) into hl7_messages."""
     if not rows:
         return 0
-    mapped = [_row_from_producer_tuple(r) for r in rows]
-    cols = ", ".join(_HL7_COLUMNS)
-    async with conn.cursor() as cursor:
-        cursor.set_settings({
-            "insert_quorum": 2,
-            "insert_quorum_parallel": 1,
-            "distributed_foreground_insert": 1,
-            "async_insert": 0,
-        })
-        await cursor.execute(
-            f"INSERT INTO {DB_NAME}.hl7_messages ({cols}) VALUES",
-            mapped,
-        )
+    await _execute_columnar_insert(conn, [r[2] for r in rows])
     return len(rows)
 
 
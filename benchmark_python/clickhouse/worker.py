@@ -5,6 +5,8 @@ import asyncio
 import logging
 import os
 import time
+from array import array
+from collections import deque
 from typing import Any
 
 from ..base_worker import BaseAsyncInsertWorker
@@ -17,8 +19,38 @@ DEFAULT_HOST = "clickhouse"
 DEFAULT_PORT = 9000
 
 
+class _ClientPool:
+    """LIFO client pool: get() pops a free client from a deque and only parks a future when none is free.
+    Same get()/put_nowait() surface as the asyncio.Queue it replaces."""
+
+    def __init__(self, clients: list) -> None:
+        self._free: deque = deque(clients)
+        self._waiters: deque[asyncio.Future] = deque()
+
+    async def get(self) -> Any:
+        if self._free:
+            return self._free.pop()
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            return await fut
+        except asyncio.CancelledError:
+            # Handed a client just before being cancelled: give it back.
+            if fut.done() and not fut.cancelled():
+                self.put_nowait(fut.result())
+            raise
+
+    def put_nowait(self, client: Any) -> None:
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(client)
+                return
+        self._free.append(client)
+
+
 class _ClickHouseResourcesAsync:
-    def __init__(self, client_queue: asyncio.Queue, connections: list) -> None:
+    def __init__(self, client_queue: _ClientPool, connections: list) -> None:
         self.client_queue = client_queue
         self.connections = connections
 
@@ -40,10 +72,7 @@ class ClickHouseWorker:
         if init_schema:
             await backend.init_schema(connections[0])
         logger.info("Starting insertions (target %d rows/sec) ...", target_rps)
-        client_queue: asyncio.Queue[Any] = asyncio.Queue()
-        for c in connections:
-            await client_queue.put(c)
-        self._resources_async = _ClickHouseResourcesAsync(client_queue, connections)
+        self._resources_async = _ClickHouseResourcesAsync(_ClientPool(connections), connections)
         return self
 
     async def teardown(self) -> None:
@@ -55,8 +84,7 @@ class ClickHouseWorker:
         self,
         insertion_queue: asyncio.Queue,
         query_queue: asyncio.Queue,
-        inserted_lock: asyncio.Lock,
-        inserted_shared: list[float],
+        inserted_shared: array,
         batch_size: int,
         queries_per_record: int = 1,
         pgbouncer_enabled: bool = False,
@@ -65,7 +93,6 @@ class ClickHouseWorker:
             insertion_queue,
             query_queue,
             self._resources_async.client_queue,
-            inserted_lock,
             inserted_shared,
             batch_size,
             queries_per_record,
@@ -76,33 +103,37 @@ class ClickHouseWorker:
         try:
             return await backend.get_max_patient_counter(conn)
         finally:
-            await self._resources_async.client_queue.put(conn)
+            self._resources_async.client_queue.put_nowait(conn)
 
 
 class ClickHouseAsyncWorker(BaseAsyncInsertWorker):
-    """Async ClickHouse worker using asynch driver (native async)."""
+    """Async ClickHouse worker using asynch driver (native async). Each run() task pins one client (pool is 2x workers)."""
+
+    pin_connection = True
 
     def __init__(
         self,
         insertion_queue: asyncio.Queue,
         query_queue: asyncio.Queue,
-        client_queue: asyncio.Queue,
-        inserted_lock: asyncio.Lock,
-        inserted_shared: list[float],
+        client_queue: _ClientPool,
+        inserted_shared: array,
         batch_size: int,
         queries_per_record: int = 1,
     ) -> None:
         self.client_queue = client_queue
-        super().__init__(insertion_queue, query_queue, inserted_lock, inserted_shared, batch_size, queries_per_record)
+        super().__init__(insertion_queue, query_queue, inserted_shared, batch_size, queries_per_record)
 
     async def get_connection(self) -> Any:
         return await self.client_queue.get()
 
     async def release_connection(self, conn: Any) -> None:
-        await self.client_queue.put(conn)
+        self.client_queue.put_nowait(conn)
+
+    async def query_by_primary_key(self, conn: Any, mrn: str) -> list:
+        return await backend.query_by_primary_key(conn, mrn)
 
     async def insert_batch(
-        self, conn: Any, batch: list[tuple[str, str, str]], query_hint: str = ""
+        self, conn: Any, batch: list[tuple], query_hint: str = ""
     ) -> tuple[int, int]:
         _ = query_hint  # unused for ClickHouse
         n = await backend.insert_batch(conn, batch)
@@ -111,23 +142,23 @@ class ClickHouseAsyncWorker(BaseAsyncInsertWorker):
 
 async def run_query_worker_clickhouse(
     query_queue: asyncio.Queue,
-    client_queue: asyncio.Queue,
-    queries_lock: asyncio.Lock,
-    queries_shared: list[float],
+    client_queue: _ClientPool,
+    queries_shared: array,
     queries_per_record: int,
     query_delay_sec: float,
     query_rate_limiter: Any,
     ignore_select_errors: bool,
 ) -> None:
+    query_delay_ns = int(query_delay_sec * 1e9)
     while True:
         item = await query_queue.get()
         if item is QUERY_SENTINEL:
             return
-        mrn, insert_time = item
-        if query_delay_sec > 0:
-            sleep_sec = insert_time + query_delay_sec - time.time()
-            if sleep_sec > 0:
-                await asyncio.sleep(sleep_sec)
+        mrn, insert_time_ns = item
+        if query_delay_ns > 0:
+            sleep_ns = insert_time_ns + query_delay_ns - time.monotonic_ns()
+            if sleep_ns > 0:
+                await asyncio.sleep(sleep_ns / 1e9)
         client = await client_queue.get()
         try:
             total_latency_sec = 0.0
@@ -145,9 +176,8 @@ async def run_query_worker_clickhouse(
                             "Query by primary key returned %d rows for MEDICAL_RECORD_NUMBER=%s (expected 1)",
                             len(rows), mrn,
                         )
-            async with queries_lock:
-                queries_shared[0] += queries_per_record
-                queries_shared[1] += total_latency_sec
-                queries_shared[2] += failed
+            queries_shared[0] += queries_per_record
+            queries_shared[1] += total_latency_sec
+            queries_shared[2] += failed
         finally:
-            await client_queue.put(client)
+            client_queue.put_nowait(client)
@@ -12,6 +12,10 @@ CLICKHOUSE_CLUSTER = "dev-cluster"
 # Storage policy for hl7_messages_local (must exist on ClickHouse server, e.g. deployments/clickhouse-storage-config.yaml).
 CLICKHOUSE_STORAGE_POLICY = os.environ.get("CLICKHOUSE_STORAGE_POLICY", "hl7_tiered")
 
+# Native-protocol block compression for ClickHouse connections: "lz4", "lz4hc" or "zstd" (needs asynch[compression]).
+# Unset/empty disables compression.
+CLICKHOUSE_COMPRESSION = os.environ.get("CLICKHOUSE_COMPRESSION", "").strip().lower() or False
+
 # Sentinels for worker shutdown (unique objects)
 INSERTION_SENTINEL = None
 QUERY_SENTINEL = object()
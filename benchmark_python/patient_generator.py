@@ -1,18 +1,24 @@
 """
 Dynamic patient generation (from clickhouse-poc).
-Generates patient records with configurable count and duplicate ratio in the required schema.
+Generates patient rows in the required schema; the producer decides which ordinals are duplicates.
 """
 from __future__ import annotations
 
+import os
 import random
 import string
 from typing import Any
 
-# Pre-generate 100 payloads at startup to avoid slow per-call generation
+# Pre-generate 100 payloads at startup to avoid slow per-call generation.
+# SOURCE payload size in bytes (env HL7_SOURCE_SIZE, default 2 MiB); set it small to benchmark
+# row throughput rather than payload bandwidth.
 _PAYLOAD_POOL_SIZE = 100
-_PAYLOAD_SIZE = 2 * 1024 * 1024  # 2 MiB
+_PAYLOAD_SIZE = int(os.environ.get("HL7_SOURCE_SIZE") or str(2 * 1024 * 1024))
+_PAYLOAD_ALPHABET = (string.ascii_letters + string.digits).encode("ascii")
+# Maps every byte value onto the alphanumeric alphabet so random bytes become payload text in one C-level pass.
+_PAYLOAD_TRANSLATE = bytes(_PAYLOAD_ALPHABET[i % len(_PAYLOAD_ALPHABET)] for i in range(256))
 _PAYLOAD_POOL: list[str] = [
-    "".join(random.choices(string.ascii_letters + string.digits, k=_PAYLOAD_SIZE))
+    random.randbytes(_PAYLOAD_SIZE).translate(_PAYLOAD_TRANSLATE).decode("ascii")
     for _ in range(_PAYLOAD_POOL_SIZE)
 ]
 
@@ -20,61 +26,71 @@ _PAYLOAD_POOL: list[str] = [
 DUPLICATE_RATIO = 0.25
 
 
-def generate_one_patient(ordinal: int, is_original: bool) -> dict[str, Any]:
-    """Generate a single patient record for the given ordinal."""
-    first_names = (
-        "John", "Jane", "Bob", "Alice", "Charlie", "Diana", "Eve", "Frank", "Grace", "Henry"
-    )
-    last_names = (
-        "Smith", "Doe", "Brown", "Johnson", "Williams", "Jones", "Garcia", "Miller", "Davis", "Wilson"
-    )
-    genders = ("male", "female", "other")
-    base_source = random.choice(_PAYLOAD_POOL)
+_FIRST_NAMES = (
+    "John", "Jane", "Bob", "Alice", "Charlie", "Diana", "Eve", "Frank", "Grace", "Henry"
+)
+_LAST_NAMES = (
+    "Smith", "Doe", "Brown", "Johnson", "Williams", "Jones", "Garcia", "Miller", "Davis", "Wilson"
+)
+_GENDERS = ("male", "female", "other")
+_GENDERS_CAPITALIZED = tuple(g.capitalize() for g in _GENDERS)
+# DATE_OF_BIRTH parts by ordinal % 40 / % 12 / % 28, formatted once instead of per patient.
+_DOB_YEARS = tuple(str(1980 + y) + "-" for y in range(40))
+_DOB_MONTHS = tuple(f"{m + 1:02d}-" for m in range(12))
+_DOB_DAYS = tuple(f"{d + 1:02d}" for d in range(28))
+
+
+# Patient field names in hl7_messages column order: the one definition of the row layout. generate_patient_row
+# emits rows in this order, and both backends derive their column lists from it, so rows go straight to the driver.
+ROW_KEYS = (
+    "FHIR_ID", "RX_PATIENT_ID", "SOURCE", "CDC", "CREATED_AT", "CREATED_BY",
+    "UPDATED_AT", "UPDATED_BY", "LOAD_DATE", "CHECKSUM", "PATIENT_ID",
+    "MEDICAL_RECORD_NUMBER", "NAME_PREFIX", "LAST_NAME", "FIRST_NAME", "NAME_SUFFIX",
+    "DATE_OF_BIRTH", "GENDER_ADMINISTRATIVE", "FHIR_GENDER_ADMINISTRATIVE",
+    "GENDER_IDENTITY", "FHIR_GENDER_IDENTITY", "MARITAL_STATUS", "FHIR_MARITAL_STATUS",
+    "RACE_DISPLAY", "FHIR_RACE_DISPLAY", "ETHNICITY_DISPLAY", "FHIR_ETHNICITY_DISPLAY",
+    "SEX_AT_BIRTH", "IS_PREGNANT",
+)
+
+
+def generate_patient_row(ordinal: int, now: Any) -> tuple:
+    """Generate the patient for the given ordinal as an hl7_messages row in column order (ROW_KEYS),
+    with CREATED_AT/UPDATED_AT set to now."""
     ord_str = f"{ordinal:010d}"
-    mrn = f"MRN-{ord_str}"
-    pid = f"patient-{ord_str}"
-    return {
-        "is_original": is_original,
-        "FHIR_ID": pid,
-        "RX_PATIENT_ID": f"rx-{pid}",
-        "SOURCE": base_source,
-        "PATIENT_ID": pid,
-        "MEDICAL_RECORD_NUMBER": mrn,
-        "NAME_PREFIX": "Mr" if ordinal % 2 == 0 else "Ms",
-        "LAST_NAME": last_names[ordinal % len(last_names)],
-        "FIRST_NAME": first_names[ordinal % len(first_names)],
-        "NAME_SUFFIX": "Jr" if ordinal % 4 == 0 else None,
-        "DATE_OF_BIRTH": f"{1980 + (ordinal % 40)}-{(ordinal % 12) + 1:02d}-{(ordinal % 28) + 1:02d}",
-        "GENDER_ADMINISTRATIVE": genders[ordinal % 3],
-        "FHIR_GENDER_ADMINISTRATIVE": genders[ordinal % 3],
-        "GENDER_IDENTITY": genders[ordinal % 3].capitalize(),
-        "FHIR_GENDER_IDENTITY": genders[ordinal % 3],
-        "MARITAL_STATUS": "Married" if ordinal % 2 == 0 else "Single",
-        "FHIR_MARITAL_STATUS": "M" if ordinal % 2 == 0 else "S",
-        "RACE_DISPLAY": "White" if ordinal % 3 == 0 else "Black or African American",
-        "FHIR_RACE_DISPLAY": "2106-3" if ordinal % 3 == 0 else "2054-5",
-        "ETHNICITY_DISPLAY": "Not Hispanic or Latino",
-        "FHIR_ETHNICITY_DISPLAY": "2186-5",
-        "SEX_AT_BIRTH": "male" if ordinal % 2 == 0 else "female",
-        "IS_PREGNANT": "false",
-    }
+    pid = "patient-" + ord_str
+    even = ordinal % 2 == 0
+    third = ordinal % 3
+    gender = _GENDERS[third]
+    return (
+        pid,  # FHIR_ID
+        "rx-" + pid,
+        random.choice(_PAYLOAD_POOL),  # SOURCE
+        None, now, None, now, None, None, None,  # CDC .. CHECKSUM
+        pid,  # PATIENT_ID
+        "MRN-" + ord_str,
+        "Mr" if even else "Ms",
+        _LAST_NAMES[ordinal % 10],
+        _FIRST_NAMES[ordinal % 10],
+        "Jr" if ordinal % 4 == 0 else None,
+        _DOB_YEARS[ordinal % 40] + _DOB_MONTHS[ordinal % 12] + _DOB_DAYS[ordinal % 28],
+        gender,
+        gender,
+        _GENDERS_CAPITALIZED[third],
+        gender,
+        "Married" if even else "Single",
+        "M" if even else "S",
+        "White" if third == 0 else "Black or African American",
+        "2106-3" if third == 0 else "2054-5",
+        "Not Hispanic or Latino",
+        "2186-5",
+        "male" if even else "female",
+        "false",
+    )
 
 
-def generate_bulk_patients(
-    start: int = 0,
-    total: int = 1000,
-    duplicate_ratio: float = 0.25,
-) -> list[dict[str, Any]]:
-    """Generate `total` patient records with duplicates in the required schema.
-    `start` is the starting counter for MRN/patient IDs so each call can produce a different range."""
-    n_unique = max(1, int(total * (1 - duplicate_ratio)))
-    patients: list[dict[str, Any]] = [
-        generate_one_patient(start + i, True) for i in range(n_unique)
-    ]
-    base_source = random.choice(_PAYLOAD_POOL)
-    n_duplicates = total - n_unique
-    for j in range(n_duplicates):
-        patients.append(patients[j % n_unique].copy())
-        patients[-1]["SOURCE"] = base_source
-        patients[-1]["is_original"] = False
-    return patients
+# generate_patient_row is positional; catch a field added, dropped or moved relative to ROW_KEYS at import time.
+_CHECK_ROW = generate_patient_row(0, None)
+assert len(_CHECK_ROW) == len(ROW_KEYS), "generate_patient_row does not match ROW_KEYS"
+assert _CHECK_ROW[ROW_KEYS.index("PATIENT_ID")] == "patient-0000000000", "generate_patient_row does not match ROW_KEYS"
+assert _CHECK_ROW[ROW_KEYS.index("MEDICAL_RECORD_NUMBER")] == "MRN-0000000000", "generate_patient_row does not match ROW_KEYS"
+del _CHECK_ROW
@@ -1,67 +1,22 @@
 """PostgreSQL backend (asyncpg): pool, schema init, batch insert, query."""
 from __future__ import annotations
 
-import json
 import logging
-from datetime import datetime, timezone
 from typing import Any
 
 import asyncpg
 
 from ..config import DB_NAME, PASSWORD, USER
+from ..patient_generator import ROW_KEYS
 
 logger = logging.getLogger(__name__)
 
-_HL7_COLUMNS = (
-    "fhir_id", "rx_patient_id", "source", "cdc", "created_at", "created_by",
-    "updated_at", "updated_by", "load_date", "checksum", "patient_id",
-    "medical_record_number", "name_prefix", "last_name", "first_name", "name_suffix",
-    "date_of_birth", "gender_administrative", "fhir_gender_administrative",
-    "gender_identity", "fhir_gender_identity", "marital_status", "fhir_marital_status",
-    "race_display", "fhir_race_display", "ethnicity_display", "fhir_ethnicity_display",
-    "sex_at_birth", "is_pregnant",
-)
+# Lower-case column names in producer row order (patient_generator.ROW_KEYS).
+_HL7_COLUMNS = tuple(k.lower() for k in ROW_KEYS)
 
 HASH_PARTITION_MODULUS = 8
 
 
-def _row_from_producer_tuple(t: tuple[str, str, str]) -> tuple:
-    _pid, _msg_type, json_str = t
-    d = json.loads(json_str)
-    now = datetime.now(timezone.utc).replace(tzinfo=None)
-    return (
-        d.get("FHIR_ID"),
-        d.get("RX_PATIENT_ID"),
-        d.get("SOURCE"),
-        d.get("CDC"),
-        d.get("CREATED_AT") or now,
-        d.get("CREATED_BY"),
-        d.get("UPDATED_AT") or now,
-        d.get("UPDATED_BY"),
-        d.get("LOAD_DATE"),
-        d.get("CHECKSUM"),
-        d.get("PATIENT_ID"),
-        d.get("MEDICAL_RECORD_NUMBER"),
-        d.get("NAME_PREFIX"),
-        d.get("LAST_NAME"),
-        d.get("FIRST_NAME"),
-        d.get("NAME_SUFFIX"),
-        d.get("DATE_OF_BIRTH"),
-        d.get("GENDER_ADMINISTRATIVE"),
-        d.get("FHIR_GENDER_ADMINISTRATIVE"),
-        d.get("GENDER_IDENTITY"),
-        d.get("FHIR_GENDER_IDENTITY"),
-        d.get("MARITAL_STATUS"),
-        d.get("FHIR_MARITAL_STATUS"),
-        d.get("RACE_DISPLAY"),
-        d.get("FHIR_RACE_DISPLAY"),
-        d.get("ETHNICITY_DISPLAY"),
-        d.get("FHIR_ETHNICITY_DISPLAY"),
-        d.get("SEX_AT_BIRTH"),
-        d.get("IS_PREGNANT"),
-    )
-
-
 async def create_pool(
     host: str,
     port: int,
@@ -153,36 +108,37 @@ async def init_schema(conn: asyncpg.Connection) -> None:
     logger.info("Table hl7_messages created with hash partitioning (modulus %d)", HASH_PARTITION_MODULUS)
 
 
-def _build_insert_sql_and_args(
-    rows: list[tuple[str, str, str]],
-    *,
-    placeholder_start: int = 1,
-) -> tuple[str, list[Any]]:
-    """Build parameterized INSERT SQL and flat args for hl7_messages. Returns (sql, args).
-    placeholder_start: first placeholder number (default 1; hint is a comment so placeholders stay from 1)."""
-    if not rows:
-        return "", []
-    mapped = [_row_from_producer_tuple(r) for r in rows]
+_TIMESTAMP_COLUMNS = frozenset({"created_at", "updated_at"})
+
+
+def _build_unnest_insert_sql() -> str:
+    """INSERT ... SELECT FROM unnest($1::text[], ...) ON CONFLICT: one array parameter per column, so the SQL text
+    is the same for every batch size and asyncpg prepares it once per connection."""
     cols = ", ".join(_HL7_COLUMNS)
-    n = len(_HL7_COLUMNS)
+    arrays = ", ".join(
+        f"${i}::{'timestamptz' if c in _TIMESTAMP_COLUMNS else 'text'}[]"
+        for i, c in enumerate(_HL7_COLUMNS, start=1)
+    )
     update_cols = [c for c in _HL7_COLUMNS if c != "medical_record_number"]
     set_clause = ", ".join(f"{c} = EXCLUDED.{c}" for c in update_cols)
-    args: list[Any] = []
-    for row in mapped:
-        args.extend(row)
-    placeholders_list = []
-    for r in range(len(mapped)):
-        base = r * n + placeholder_start
-        placeholders_list.append("(" + ", ".join(f"${base + j}" for j in range(n)) + ")")
-    values_sql = ", ".join(placeholders_list)
-    sql = (
-        f"INSERT INTO hl7_messages ({cols}) VALUES {values_sql} "
+    return (
+        f"INSERT INTO hl7_messages ({cols}) SELECT * FROM unnest({arrays}) "
         f"ON CONFLICT (medical_record_number) DO UPDATE SET {set_clause}"
     )
-    return sql, args
 
 
-async def insert_batch(conn: asyncpg.Connection, rows: list[tuple[str, str, str]]) -> int:
+_INSERT_SQL = _build_unnest_insert_sql()
+
+
+def _build_insert_sql_and_args(rows: list[tuple]) -> tuple[str, list[Any]]:
+    """Build the INSERT SQL and its args for hl7_messages: one list per column. Returns (sql, args)."""
+    if not rows:
+        return "", []
+    columns = zip(*(r[2] for r in rows))
+    return _INSERT_SQL, [list(c) for c in columns]
+
+
+async def insert_batch(conn: asyncpg.Connection, rows: list[tuple]) -> int:
     """Insert rows with a single connection. Returns number of rows inserted."""
     if not rows:
         return 0
@@ -191,6 +147,44 @@ async def insert_batch(conn: asyncpg.Connection, rows: list[tuple[str, str, str]
     return len(rows)
 
 
+_COPY_STAGING_TABLE = "hl7_messages_copy"
+# Per-session staging table for COPY; ON COMMIT DELETE ROWS empties it at the end of each load transaction.
+_CREATE_COPY_STAGING_SQL = (
+    f"CREATE TEMP TABLE IF NOT EXISTS {_COPY_STAGING_TABLE} (LIKE hl7_messages) ON COMMIT DELETE ROWS"
+)
+
+
+def _build_copy_merge_sql() -> str:
+    """Move the staged COPY rows into hl7_messages with the same ON CONFLICT upsert as the INSERT path."""
+    cols = ", ".join(_HL7_COLUMNS)
+    update_cols = [c for c in _HL7_COLUMNS if c != "medical_record_number"]
+    set_clause = ", ".join(f"{c} = EXCLUDED.{c}" for c in update_cols)
+    return (
+        f"INSERT INTO hl7_messages ({cols}) SELECT {cols} FROM {_COPY_STAGING_TABLE} "
+        f"ON CONFLICT (medical_record_number) DO UPDATE SET {set_clause}"
+    )
+
+
+_COPY_MERGE_SQL = _build_copy_merge_sql()
+
+
+async def copy_batch(conn: asyncpg.Connection, rows: list[tuple]) -> int:
+    """Bulk-load rows with binary COPY into a temp staging table, then upsert them into hl7_messages in the same
+    transaction, so an MRN that is already present (e.g. written by a concurrent duplicate) is updated rather than
+    failing the load. Rows must have distinct MRNs. Returns rows loaded."""
+    if not rows:
+        return 0
+    async with conn.transaction():
+        await conn.execute(_CREATE_COPY_STAGING_SQL)
+        await conn.copy_records_to_table(
+            _COPY_STAGING_TABLE,
+            records=[r[2] for r in rows],
+            columns=_HL7_COLUMNS,
+        )
+        await conn.execute(_COPY_MERGE_SQL)
+    return len(rows)
+
+
 # PgBouncer: query_hint is the prepared hint string (two separate comments) prepended to INSERT.
 PGBOUNCER_DB1 = "postgres1"
 PGBOUNCER_DB2 = "postgres2"
@@ -207,24 +201,26 @@ def database_from_query_hint(query_hint: str) -> str:
 
 async def insert_batch_with_pgbouncer_hint(
     conn: asyncpg.Connection,
-    rows: list[tuple[str, str, str]],
+    rows: list[tuple],
     query_hint: str,
 ) -> int:
     """Execute query_hint + INSERT in one round-trip. query_hint is the prepared string from the producer. Returns rows inserted."""
     if not rows:
         return 0
-    insert_sql, insert_args = _build_insert_sql_and_args(rows, placeholder_start=1)
+    insert_sql, insert_args = _build_insert_sql_and_args(rows)
     combined_sql = query_hint + insert_sql
     await conn.execute(combined_sql, *insert_args)
     return len(rows)
 
 
+_SELECT_BY_PK_SQL = "SELECT * FROM hl7_messages WHERE medical_record_number = $1"
+
+
 async def query_by_primary_key(conn: asyncpg.Connection, medical_record_number: str) -> list:
-    rows = await conn.fetch(
-        "SELECT * FROM hl7_messages WHERE medical_record_number = $1",
-        medical_record_number,
-    )
-    return [dict(r) for r in rows]
+    """At most one row by primary key. asyncpg caches the prepared statement per connection; the Record is
+    returned as-is rather than copied into a dict (callers only count rows)."""
+    row = await conn.fetchrow(_SELECT_BY_PK_SQL, medical_record_number)
+    return [row] if row is not None else []
 
 
 async def get_max_patient_counter(conn: asyncpg.Connection) -> int:
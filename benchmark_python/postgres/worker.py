@@ -5,11 +5,13 @@ import asyncio
 import logging
 import os
 import time
+from array import array
 from typing import Any
 
 from ..base_worker import (
     BaseAsyncInsertWorker,
     _mrns_from_batch,
+    _put_many,
     _split_originals_duplicates,
 )
 from ..config import QUERY_SENTINEL
@@ -22,6 +24,9 @@ DEFAULT_PORT = 5432
 # When pgbouncer is enabled, connect to pgbouncer (not Postgres directly).
 DEFAULT_PGBOUNCER_HOST = "pgbouncer"
 DEFAULT_PGBOUNCER_PORT = 6432
+# Sub-batches of originals at least this large are loaded with COPY (via a staging table) instead of INSERT.
+# Opt-in: 0 disables it; set with env POSTGRES_COPY_MIN_ROWS.
+DEFAULT_COPY_MIN_ROWS = 0
 
 
 class PostgresWorker(BaseAsyncInsertWorker):
@@ -31,13 +36,14 @@ class PostgresWorker(BaseAsyncInsertWorker):
         self.insert_pool = None
         self.select_pool = None
         self.pgbouncer_enabled = False
+        self.copy_min_rows = 0
         # BaseAsyncInsertWorker attributes (set in make_worker before run() is used)
         self.insertion_queue = None
         self.query_queue = None
-        self.inserted_lock = None
         self.inserted_shared = None
         self.batch_size = 0
         self.queries_per_record = 1
+        self._init_worker_state()
 
     async def setup(
         self,
@@ -45,11 +51,21 @@ class PostgresWorker(BaseAsyncInsertWorker):
         target_rps: int,
         init_schema: bool = True,
         pgbouncer_enabled: bool = False,
+        copy_min_rows: int | None = None,
     ) -> PostgresWorker:
-        """Create asyncpg pools, prewarm, optionally init schema. Returns self."""
+        """Create asyncpg pools, prewarm, optionally init schema. Returns self.
+        copy_min_rows overrides env POSTGRES_COPY_MIN_ROWS (default DEFAULT_COPY_MIN_ROWS); ignored with pgbouncer."""
         if self.insert_pool is not None:
             raise RuntimeError("PostgresWorker.setup() already called")
         self.pgbouncer_enabled = pgbouncer_enabled
+        # The insert pool has one connection per worker, so on direct connections each run() task keeps its own
+        # for the whole run. PgBouncer mode takes a fresh connection per sub-batch (one hint + INSERT each).
+        self.pin_connection = not pgbouncer_enabled
+        # COPY cannot carry the pgbouncer routing hint, so it is only used on direct connections.
+        if not pgbouncer_enabled:
+            if copy_min_rows is None:
+                copy_min_rows = int(os.environ.get("POSTGRES_COPY_MIN_ROWS") or str(DEFAULT_COPY_MIN_ROWS))
+            self.copy_min_rows = copy_min_rows
         if pgbouncer_enabled:
             host = os.environ.get("POSTGRES_PGBOUNCER_HOST") or DEFAULT_PGBOUNCER_HOST
             port = int(os.environ.get("POSTGRES_PGBOUNCER_PORT") or str(DEFAULT_PGBOUNCER_PORT))
@@ -65,10 +81,15 @@ class PostgresWorker(BaseAsyncInsertWorker):
         )
         skip_session_set = pgbouncer_enabled
         pool_kw: dict[str, Any] = {"database": database} if database else {}
-        self.insert_pool = await backend.create_pool(host, port, num_workers, **pool_kw)
-        await backend.prewarm_pool(self.insert_pool, num_workers, skip_session_set=skip_session_set)
-        self.select_pool = await backend.create_pool(host, port, num_workers, **pool_kw)
-        await backend.prewarm_pool(self.select_pool, num_workers, skip_session_set=skip_session_set)
+        # Both pools connect and prewarm concurrently (asyncpg already opens each pool's connections in parallel).
+        self.insert_pool, self.select_pool = await asyncio.gather(
+            backend.create_pool(host, port, num_workers, **pool_kw),
+            backend.create_pool(host, port, num_workers, **pool_kw),
+        )
+        await asyncio.gather(
+            backend.prewarm_pool(self.insert_pool, num_workers, skip_session_set=skip_session_set),
+            backend.prewarm_pool(self.select_pool, num_workers, skip_session_set=skip_session_set),
+        )
         if init_schema:
             conn = await self.insert_pool.acquire()
             try:
@@ -90,8 +111,7 @@ class PostgresWorker(BaseAsyncInsertWorker):
         self,
         insertion_queue: asyncio.Queue[tuple[str, list] | None],
         query_queue: asyncio.Queue,
-        inserted_lock: asyncio.Lock,
-        inserted_shared: list[float],
+        inserted_shared: array,
         batch_size: int,
         queries_per_record: int = 1,
         pgbouncer_enabled: bool = False,
@@ -99,7 +119,6 @@ class PostgresWorker(BaseAsyncInsertWorker):
         """Set queue/state for run() and return self (this object is the insert worker)."""
         self.insertion_queue = insertion_queue
         self.query_queue = query_queue
-        self.inserted_lock = inserted_lock
         self.inserted_shared = inserted_shared
         self.batch_size = batch_size
         self.queries_per_record = queries_per_record
@@ -118,7 +137,7 @@ class PostgresWorker(BaseAsyncInsertWorker):
     async def release_connection(self, conn: Any) -> None:
         await self.insert_pool.release(conn)
 
-    async def _flush(self, batch: list, query_hint: str = "") -> None:
+    async def _flush(self, batch: list, query_hint: str = "", conn: Any = None) -> None:
         """When pgbouncer is enabled, use a separate connection per sub-batch (originals,
         then duplicates) so only one hint + INSERT runs per connection.
         query_hint is the prepared hint string set by the producer.
@@ -126,11 +145,13 @@ class PostgresWorker(BaseAsyncInsertWorker):
         if not batch:
             return
         if not self.pgbouncer_enabled:
-            await super()._flush(batch, query_hint)
+            await super()._flush(batch, query_hint, conn)
             return
         originals, duplicates = _split_originals_duplicates(batch)
-        async with self.inserted_lock:
-            self.inserted_shared[5] += 1
+        # Rows routed to postgres1/postgres2 are tallied in inserted_shared[7]/[8].
+        db_used = backend.database_from_query_hint(query_hint)
+        db_slot = 7 if db_used == backend.PGBOUNCER_DB1 else 8
+        self.inserted_shared[5] += 1
         total_rows = 0
         total_latency_sec = 0.0
         n_statements = 0
@@ -138,87 +159,80 @@ class PostgresWorker(BaseAsyncInsertWorker):
             if originals:
                 conn = await self.get_connection()
                 try:
-                    rows_db = [(r[0], r[1], r[2]) for r in originals]
                     t0 = time.perf_counter()
-                    n, stmts, db_used = await self.insert_batch(conn, rows_db, query_hint)
+                    n, stmts = await self.insert_batch(conn, originals, query_hint)
                     total_rows += n
                     total_latency_sec += time.perf_counter() - t0
                     n_statements += stmts
                     if db_used:
-                        async with self.inserted_lock:
-                            if db_used == backend.PGBOUNCER_DB1:
-                                self.inserted_shared[7] += n
-                            else:
-                                self.inserted_shared[8] += n
+                        self.inserted_shared[db_slot] += n
                 finally:
                     await self.release_connection(conn)
             if duplicates:
                 conn = await self.get_connection()
                 try:
-                    rows_db = [(r[0], r[1], r[2]) for r in duplicates]
                     t0 = time.perf_counter()
-                    n, stmts, db_used = await self.insert_batch(conn, rows_db, query_hint)
+                    n, stmts = await self.insert_batch(conn, duplicates, query_hint)
                     total_rows += n
                     total_latency_sec += time.perf_counter() - t0
                     n_statements += stmts
                     if db_used:
-                        async with self.inserted_lock:
-                            if db_used == backend.PGBOUNCER_DB1:
-                                self.inserted_shared[7] += n
-                            else:
-                                self.inserted_shared[8] += n
+                        self.inserted_shared[db_slot] += n
                 finally:
                     await self.release_connection(conn)
-            n_originals = len(originals)
-            n_duplicates = len(duplicates)
-            async with self.inserted_lock:
-                self.inserted_shared[0] += total_rows
-                self.inserted_shared[1] += n_originals
-                self.inserted_shared[2] += n_duplicates
-                self.inserted_shared[3] += total_latency_sec
-                self.inserted_shared[4] += n_statements
+            self._add_insert_stats(
+                total_rows, len(originals), len(duplicates), total_latency_sec, n_statements
+            )
             if self.queries_per_record > 0:
-                insert_time = time.time()
-                for mrn in _mrns_from_batch(batch):
-                    await self.query_queue.put((mrn, insert_time))
+                if self.fused_queries:
+                    conn = await self.get_connection()
+                    try:
+                        await self._query_inline(conn, _mrns_from_batch(batch))
+                    finally:
+                        await self.release_connection(conn)
+                else:
+                    insert_time_ns = time.monotonic_ns()
+                    await _put_many(self.query_queue, [(mrn, insert_time_ns) for mrn in _mrns_from_batch(batch)])
         finally:
-            async with self.inserted_lock:
-                self.inserted_shared[5] -= 1
-                if self.inserted_shared[5] < 0:
-                    self.inserted_shared[5] = 0
+            self.inserted_shared[5] = max(0, self.inserted_shared[5] - 1)
+
+    async def query_by_primary_key(self, conn: Any, mrn: str) -> list:
+        return await backend.query_by_primary_key(conn, mrn)
 
     async def insert_batch(
-        self, conn: Any, batch: list[tuple[str, str, str]], query_hint: str = ""
-    ) -> tuple[int, int, str | None]:
-        """Returns (rows_inserted, statement_count, db_used). query_hint is the prepared hint string."""
+        self, conn: Any, batch: list[tuple], query_hint: str = ""
+    ) -> tuple[int, int]:
+        """Returns (rows_inserted, statement_count). query_hint is the prepared hint string."""
         if self.pgbouncer_enabled and query_hint:
             n = await backend.insert_batch_with_pgbouncer_hint(conn, batch, query_hint)
-            db_used = backend.database_from_query_hint(query_hint)
-            return n, 1, db_used
-        n = await backend.insert_batch(conn, batch)
-        return n, 1, None
+            return n, 1
+        if self.copy_min_rows and len(batch) >= self.copy_min_rows and all(r[3] for r in batch):
+            n = await backend.copy_batch(conn, batch)
+        else:
+            n = await backend.insert_batch(conn, batch)
+        return n, 1
 
 
 async def run_query_worker_postgres(
     query_queue: asyncio.Queue,
     pool: Any,
-    queries_lock: asyncio.Lock,
-    queries_shared: list[float],
+    queries_shared: array,
     queries_per_record: int,
     query_delay_sec: float,
     query_rate_limiter: Any,
     ignore_select_errors: bool,
 ) -> None:
+    query_delay_ns = int(query_delay_sec * 1e9)
     while True:
         item = await query_queue.get()
         if item is QUERY_SENTINEL:
             return
-        mrn, insert_time = item
-        if query_delay_sec > 0:
-            deadline = insert_time + query_delay_sec
-            sleep_sec = deadline - time.time()
-            if sleep_sec > 0:
-                await asyncio.sleep(sleep_sec)
+        mrn, insert_time_ns = item
+        if query_delay_ns > 0:
+            deadline_ns = insert_time_ns + query_delay_ns
+            sleep_ns = deadline_ns - time.monotonic_ns()
+            if sleep_ns > 0:
+                await asyncio.sleep(sleep_ns / 1e9)
         conn = await pool.acquire()
         try:
             total_latency_sec = 0.0
@@ -236,9 +250,8 @@ async def run_query_worker_postgres(
                             "Query by primary key returned %d rows for MEDICAL_RECORD_NUMBER=%s (expected 1)",
                             len(rows), mrn,
                         )
-            async with queries_lock:
-                queries_shared[0] += queries_per_record
-                queries_shared[1] += total_latency_sec
-                queries_shared[2] += failed
+            queries_shared[0] += queries_per_record
+            queries_shared[1] += total_latency_sec
+            queries_shared[2] += failed
         finally:
             await pool.release(conn)
@@ -2,16 +2,19 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import random
 import threading
 import time
+from datetime import datetime, timezone
 from typing import Any
 
 from .config import INSERTION_SENTINEL
-from .patient_generator import generate_one_patient, DUPLICATE_RATIO
+from .patient_generator import ROW_KEYS, generate_patient_row, DUPLICATE_RATIO
 
-Record = tuple[str, str, str, bool]
+Record = tuple[str, str, tuple, bool, str]  # (pid, msg_type, row, is_original, mrn)
+
+_PATIENT_ID_IDX = ROW_KEYS.index("PATIENT_ID")
+_MRN_IDX = ROW_KEYS.index("MEDICAL_RECORD_NUMBER")
 
 
 class SyncCounter:
@@ -32,7 +35,7 @@ class SyncCounter:
     def value(self, v: int) -> None:
         self._value = v
 
-# Message type for rows built from generate_one_patient (patient record as message body)
+# Message type for rows built from generate_patient_row (patient record as message body)
 PATIENT_MESSAGE_TYPE = "PATIENT"
 
 
@@ -41,14 +44,17 @@ def build_one_batch(
     patient_start_base: int,
     batch_index: int,
     duplicate_ratio: float = DUPLICATE_RATIO,
+    count: int | None = None,
 ) -> list[Record]:
     """Build one batch of records. Patient ordinals are derived from batch_index (deterministic, no next_id contention).
     Originals at patient_start_base + batch_index*batch_size + i; duplicates random in [patient_start_base, base). Batch 0 has no duplicate range.
+    count (default batch_size) builds a shorter batch, e.g. the last one of a run, on the same batch_size ordinal grid.
     """
     batch: list[Record] = []
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
     base = patient_start_base + batch_index * batch_size
     dup_end = base  # exclusive upper bound for duplicate ordinals
-    for i in range(batch_size):
+    for i in range(batch_size if count is None else count):
         if random.random() < duplicate_ratio and dup_end > patient_start_base:
             n = dup_end - patient_start_base
             ordinal = patient_start_base + (random.randint(0, n - 1) if n > 1 else 0)
@@ -56,12 +62,13 @@ def build_one_batch(
         else:
             ordinal = base + i
             is_original = True
-        p = generate_one_patient(ordinal, is_original)
+        row = generate_patient_row(ordinal, now)
         record: Record = (
-            p["PATIENT_ID"],
+            row[_PATIENT_ID_IDX],
             PATIENT_MESSAGE_TYPE,
-            json.dumps(p, default=str),
-            p["is_original"],
+            row,
+            is_original,
+            row[_MRN_IDX],
         )
         batch.append(record)
     return batch
@@ -94,14 +101,17 @@ async def run_batch_producer(
     insert_rate_limiter: Any = None,
     pgbouncer_enabled: bool = False,
 ) -> None:
-    """Async round-robin producer: rate-limit then put (target_db, batch). Batch is built from batch index (deterministic patient ordinals)."""
+    """Async round-robin producer: rate-limit then put (target_db, batch). Batch is built from batch index (deterministic patient ordinals).
+    A lone producer (recv_trigger is send_trigger) skips the trigger hand-off and its wait_for per batch."""
+    solo = recv_trigger is send_trigger
     while not stop_event.is_set():
-        try:
-            await asyncio.wait_for(recv_trigger.get(), timeout=0.1)
-        except asyncio.TimeoutError:
-            continue
-        if stop_event.is_set():
-            break
+        if not solo:
+            try:
+                await asyncio.wait_for(recv_trigger.get(), timeout=0.1)
+            except asyncio.TimeoutError:
+                continue
+            if stop_event.is_set():
+                break
         if insert_rate_limiter is not None:
             await insert_rate_limiter.acquire(batch_size)
         with next_batch_index.get_lock():
@@ -110,7 +120,8 @@ async def run_batch_producer(
         batch = build_one_batch(batch_size, patient_start_base, idx, duplicate_ratio)
         query_hint = build_query_hint(idx, batch, pgbouncer_enabled)
         await insertion_queue.put((query_hint, batch))
-        send_trigger.put_nowait(None)
+        if not solo:
+            send_trigger.put_nowait(None)
 
 
 async def run_producer(
@@ -127,29 +138,27 @@ async def run_producer(
 ) -> None:
     """Async producer: enqueue (target_db, batch) at target_rps until max_records reached. Batch built from batch index (deterministic)."""
     interval_per_batch = batch_size / target_rps if target_rps > 0 and batch_size > 0 else 0.0
-    start = time.perf_counter()
-    next_put_at = start
+    put = insertion_queue.put
+    next_put_at = time.perf_counter()
     count = 0
-    while True:
-        if max_records is not None and count >= max_records:
-            break
-        remaining = max_records - count if max_records is not None else batch_size
-        this_batch_size = min(batch_size, remaining) if max_records is not None else batch_size
+    while max_records is None or count < max_records:
+        this_batch_size = min(batch_size, max_records - count) if max_records is not None else batch_size
         if this_batch_size <= 0:
             break
-        now = time.perf_counter()
-        if now < next_put_at:
-            await asyncio.sleep(min(0.01, next_put_at - now))
-            continue
+        # Sleep straight to the deadline (one wake-up per batch) instead of polling in short slices.
+        delay = next_put_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
         with next_batch_index.get_lock():
             idx = next_batch_index.value
             next_batch_index.value += 1
-        batch = build_one_batch(this_batch_size, patient_start_base, idx, duplicate_ratio)
+        batch = build_one_batch(batch_size, patient_start_base, idx, duplicate_ratio, this_batch_size)
         query_hint = build_query_hint(idx, batch, pgbouncer_enabled)
-        await insertion_queue.put((query_hint, batch))
+        await put((query_hint, batch))
         count += len(batch)
-        next_put_at = next_put_at + interval_per_batch
-        if next_put_at < time.perf_counter():
-            next_put_at = time.perf_counter() + interval_per_batch
+        now = time.perf_counter()
+        next_put_at += interval_per_batch
+        if next_put_at < now:  # fell behind: resume pacing from now rather than bursting to catch up
+            next_put_at = now + interval_per_batch
     for _ in range(sentinels):
         await insertion_queue.put(INSERTION_SENTINEL)
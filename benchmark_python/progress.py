@@ -3,6 +3,8 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
+from array import array
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -89,14 +91,13 @@ def _fmt_query_data(
     )
 
 async def run_progress_logger(
-    inserted_lock: asyncio.Lock,
-    inserted_shared: list[float],
+    inserted_shared: array,
     stop_event: asyncio.Event,
-    queries_lock: asyncio.Lock,
-    queries_shared: list[float],
+    queries_shared: array,
     interval_sec: float = 5.0,
 ) -> None:
-    """Log insert/query counts every interval_sec until stop_event is set (same columns as Go)."""
+    """Log insert/query counts every interval_sec until stop_event is set (same columns as Go).
+    Counters are read without locks: the snapshot below has no await, so no worker update can land mid-read."""
     prev_inserted = [0.0, 0.0, 0.0, 0.0, 0.0]
     prev_insert_started = 0.0
     prev_postgres1 = 0.0
@@ -104,26 +105,32 @@ async def run_progress_logger(
     prev_queries = 0.0
     prev_query_latency_sec = 0.0
     prev_failed = 0.0
+    # Headers never change; format them once rather than every interval.
+    insert_header = _fmt_insert_header()
+    query_header = _fmt_query_header()
+    # Ticks are scheduled from a fixed start so the logger's own work does not stretch the intervals.
+    deadline = time.monotonic() + interval_sec
     while not stop_event.is_set():
         try:
-            await asyncio.wait_for(stop_event.wait(), timeout=interval_sec)
+            await asyncio.wait_for(stop_event.wait(), timeout=max(0.0, deadline - time.monotonic()))
         except asyncio.TimeoutError:
             pass
         if stop_event.is_set():
             break
-        async with inserted_lock:
-            total = inserted_shared[0]
-            originals = inserted_shared[1]
-            duplicates = inserted_shared[2]
-            total_insert_latency_sec = inserted_shared[3]
-            insert_statements = inserted_shared[4]
-            cur_insert_started = inserted_shared[6]
-            postgres1_cum = inserted_shared[7] if len(inserted_shared) > 7 else 0.0
-            postgres2_cum = inserted_shared[8] if len(inserted_shared) > 8 else 0.0
-        async with queries_lock:
-            q = int(queries_shared[0])
-            total_latency_sec = queries_shared[1]
-            failed = queries_shared[2]
+        deadline += interval_sec
+        if deadline < time.monotonic():  # stalled past a whole interval: resume from now rather than logging back-to-back
+            deadline = time.monotonic() + interval_sec
+        total = inserted_shared[0]
+        originals = inserted_shared[1]
+        duplicates = inserted_shared[2]
+        total_insert_latency_sec = inserted_shared[3]
+        insert_statements = inserted_shared[4]
+        cur_insert_started = inserted_shared[6]
+        postgres1_cum = inserted_shared[7] if len(inserted_shared) > 7 else 0.0
+        postgres2_cum = inserted_shared[8] if len(inserted_shared) > 8 else 0.0
+        q = int(queries_shared[0])
+        total_latency_sec = queries_shared[1]
+        failed = queries_shared[2]
         interval_insert_started = int(cur_insert_started - prev_insert_started)
         prev_insert_started = cur_insert_started
         interval_postgres1 = int(postgres1_cum - prev_postgres1)
@@ -146,8 +153,10 @@ async def run_progress_logger(
         prev_failed = failed
         avg_latency_ms = (total_latency_sec / q * 1000.0) if q > 0 else 0.0
         interval_avg_ms = (interval_query_latency_sec / interval_q * 1000.0) if interval_q > 0 else 0.0
+        if not logger.isEnabledFor(logging.INFO):
+            continue  # keep the interval baselines, skip building the rows
         logger.info("%s---%s", DIM, RESET)
-        logger.info("%s", _fmt_insert_header())
+        logger.info("%s", insert_header)
         logger.info(
             "%s",
             _fmt_insert_data(
@@ -170,7 +179,7 @@ async def run_progress_logger(
             CYAN, COL_W, interval_postgres2, RESET,
             CYAN, COL_W, int(postgres2_cum), RESET,
         )
-        logger.info("%s", _fmt_query_header())
+        logger.info("%s", query_header)
         logger.info(
             "%s",
             _fmt_query_data(interval_q, interval_failed, interval_avg_ms, q, int(failed), avg_latency_ms),
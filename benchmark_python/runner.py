@@ -4,6 +4,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
+from array import array
 from typing import Any
 
 from aiolimiter import AsyncLimiter
@@ -37,7 +38,7 @@ from .progress import run_progress_logger
 
 logger = logging.getLogger(__name__)
 
-Record = tuple[str, str, str, bool]
+Record = tuple[str, str, tuple, bool, str]
 Batch = list[Record]
 
 
@@ -50,6 +51,12 @@ def _worker_for_database(database: str):
     return clickhouse.ClickHouseWorker
 
 
+def _log_worker_failure(task: asyncio.Task) -> None:
+    """Done callback: report a crashed worker task right away instead of only when run_load gathers it at the end."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Worker task %s failed", task.get_name(), exc_info=task.exception())
+
+
 def _postgres_host_port(pgbouncer_enabled: bool) -> tuple[str, int]:
     import os
     if pgbouncer_enabled:
@@ -102,23 +109,30 @@ async def run_load(
     duplicate_ratio: float = 0.25,
     shutdown_event: asyncio.Event | None = None,
     pgbouncer_enabled: bool = False,
+    fused_queries: bool = False,
+    bulk: bool = False,
 ) -> None:
-    """Run load: asyncio queues, workers and producers, single process. shutdown_event set on Ctrl+C for smooth exit."""
+    """Run load: asyncio queues, workers and producers, single process. shutdown_event set on Ctrl+C for smooth exit.
+    fused_queries: insert workers run each batch's primary-key queries themselves right after the INSERT (no query workers).
+    bulk: load every all-original sub-batch with COPY (postgres without pgbouncer; overrides POSTGRES_COPY_MIN_ROWS)."""
     num_workers = workers
     # Queue carries (query_hint, batch); query_hint is the prepared hint string to prepend to the INSERT. Sentinel is INSERTION_SENTINEL.
     insertion_queue: asyncio.Queue[tuple[str, Batch] | None] = asyncio.Queue(maxsize=max(num_workers * 32, target_rps * 4))
     next_batch_index = SyncCounter(0)
     query_queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=max(num_workers * 4, batch_size * num_workers * 4, target_rps * 4))
-    inserted_lock = asyncio.Lock()
-    inserted_shared: list[float] = [0, 0, 0, 0.0, 0, 0, 0, 0, 0]  # [7]=postgres1, [8]=postgres2
-    queries_lock = asyncio.Lock()
-    queries_shared: list[float] = [0, 0.0, 0.0]
+    # Flat C doubles; updated in place without locks (single event loop, no await inside an update).
+    inserted_shared = array("d", [0.0] * 9)  # [7]=postgres1, [8]=postgres2
+    queries_shared = array("d", [0.0] * 3)
     progress_stop = asyncio.Event()
     run_start = time.perf_counter()
 
     use_fixed_count = total_records is not None
     if use_fixed_count and total_records <= 0:
         raise ValueError("total_records must be >= 1 when set")
+    if fused_queries and query_delay_sec > 0:
+        raise ValueError("fused_queries requires query_delay_sec == 0")
+    if bulk and (database != "postgres" or pgbouncer_enabled):
+        raise ValueError("bulk requires database postgres without pgbouncer")
 
     logger.info(
         "Connecting to %s (workers=%d, producers=%d, batch_size=%d, duration=%.1fs, target_rps=%d, queries_per_record=%d, query_delay=%.0fms, duplicate_ratio=%.2f)",
@@ -133,43 +147,54 @@ async def run_load(
 
     Worker = _worker_for_database(database)
     worker_ctx = Worker()
-    await worker_ctx.setup(num_workers, target_rps, init_schema=True, pgbouncer_enabled=pgbouncer_enabled)
+    setup_kw: dict[str, Any] = {"pgbouncer_enabled": pgbouncer_enabled}
+    if bulk:
+        setup_kw["copy_min_rows"] = 1
+    await worker_ctx.setup(num_workers, target_rps, init_schema=True, **setup_kw)
     worker_inst = worker_ctx.make_worker(
-        insertion_queue, query_queue, inserted_lock, inserted_shared, batch_size, queries_per_record,
+        insertion_queue, query_queue, inserted_shared, batch_size, queries_per_record,
         pgbouncer_enabled=pgbouncer_enabled,
     )
-    run_query_workers = queries_per_record > 0
+    run_query_workers = queries_per_record > 0 and not fused_queries
+    if fused_queries and queries_per_record > 0:
+        logger.info("Fused mode: insert workers run %d queries per record inline after each INSERT", queries_per_record)
+        worker_inst.enable_fused_queries(queries_shared, query_rate_limiter, ignore_select_errors)
 
     progress_task = asyncio.create_task(
         run_progress_logger(
-            inserted_lock, inserted_shared, progress_stop,
-            queries_lock, queries_shared,
+            inserted_shared, progress_stop, queries_shared,
             interval_sec=5.0,
         )
     )
-    insert_tasks = [asyncio.create_task(worker_inst.run()) for _ in range(num_workers)]
+    insert_tasks = [asyncio.create_task(worker_inst.run(), name=f"insert-{i}") for i in range(num_workers)]
+    for t in insert_tasks:
+        t.add_done_callback(_log_worker_failure)
     query_tasks: list[asyncio.Task[None]] = []
     if run_query_workers:
         if database == "postgres":
             from . import postgres
-            for _ in range(num_workers):
+            for i in range(num_workers):
                 query_tasks.append(asyncio.create_task(
                     postgres.run_query_worker_postgres(
                         query_queue, worker_ctx.select_pool,
-                        queries_lock, queries_shared,
+                        queries_shared,
                         queries_per_record, query_delay_sec, query_rate_limiter, ignore_select_errors,
-                    )
+                    ),
+                    name=f"query-{i}",
                 ))
         else:
             from . import clickhouse
-            for _ in range(num_workers):
+            for i in range(num_workers):
                 query_tasks.append(asyncio.create_task(
                     clickhouse.run_query_worker_clickhouse(
                         query_queue, worker_ctx._resources_async.client_queue,
-                        queries_lock, queries_shared,
+                        queries_shared,
                         queries_per_record, query_delay_sec, query_rate_limiter, ignore_select_errors,
-                    )
+                    ),
+                    name=f"query-{i}",
                 ))
+        for t in query_tasks:
+            t.add_done_callback(_log_worker_failure)
 
     if use_fixed_count:
         max_counter = await worker_ctx.get_max_patient_counter()
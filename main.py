@@ -8,6 +8,7 @@ Uses asyncio for producers, insert workers, and query workers; no multiprocessin
 import argparse
 import asyncio
 import logging
+import os
 import signal
 from datetime import datetime
 
@@ -44,6 +45,20 @@ _configure_logging()
 logger = logging.getLogger(__name__)
 
 
+def _parse_cpu_list(spec: str) -> set[int]:
+    """Parse a CPU list like '0-3,6' into {0, 1, 2, 3, 6}."""
+    cpus: set[int] = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        lo, _, hi = part.partition("-")
+        cpus.update(range(int(lo), int(hi or lo) + 1))
+    if not cpus:
+        raise ValueError("empty CPU list")
+    return cpus
+
+
 async def main_async() -> None:
     p = argparse.ArgumentParser(
         description="HL7 messages load driver — async, single process, configurable producers",
@@ -55,18 +70,38 @@ async def main_async() -> None:
     p.add_argument("--duplicate-ratio", type=float, default=0.25, help="Ratio of duplicate records (0-1, default 0.25)")
     p.add_argument("--workers", type=int, default=5, help="Number of insert/query worker coroutines")
     p.add_argument("--rows-per-second", type=int, default=1000, help="Target insert rate (rows/sec)")
-    p.add_argument("--producers", type=int, default=2, help="Number of producer coroutines (minimum 2 for duration-based)")
+    p.add_argument("--producers", type=int, default=2, help="Number of producer coroutines; with 1 the producer skips the round-robin trigger hand-off")
     p.add_argument("--queries-per-record", type=int, default=10, help="Primary-key queries per inserted record")
     p.add_argument("--query-delay", type=float, default=0.0, help="Fixed delay in ms before querying each record (0 = no delay)")
     p.add_argument("--ignore-select-errors", action="store_true", help="Do not log when primary-key query returns != 1 row")
+    p.add_argument("--cpu-affinity", default=None, help="Pin the driver process to these CPUs, e.g. 0-3 or 0,2 (Linux only); keeps the event loop off the cores running the database")
+    p.add_argument("--bulk", action="store_true", help="Load every all-original sub-batch with COPY (staged, then upserted) instead of INSERT, whatever its size (postgres without --pgbouncer-enabled; overrides POSTGRES_COPY_MIN_ROWS)")
+    p.add_argument("--fused-queries", action="store_true", help="Run primary-key queries in the insert worker right after each INSERT instead of separate query workers (requires --query-delay 0)")
     args = p.parse_args()
 
     if args.workers < 1:
         p.error("--workers must be >= 1")
-    if args.producers < 2:
-        p.error("--producers must be >= 2")
+    if args.producers < 1:
+        p.error("--producers must be >= 1")
     if not (0 <= args.duplicate_ratio <= 1):
         p.error("--duplicate-ratio must be between 0 and 1")
+    if args.fused_queries and args.query_delay > 0:
+        p.error("--fused-queries requires --query-delay 0")
+    if args.bulk and (args.database != "postgres" or args.pgbouncer_enabled):
+        p.error("--bulk requires --database postgres without --pgbouncer-enabled")
+
+    if args.cpu_affinity:
+        try:
+            cpus = _parse_cpu_list(args.cpu_affinity)
+        except ValueError:
+            p.error(f"--cpu-affinity: invalid CPU list {args.cpu_affinity!r}")
+        if not hasattr(os, "sched_setaffinity"):
+            p.error("--cpu-affinity is not supported on this platform")
+        try:
+            os.sched_setaffinity(0, cpus)
+        except OSError as e:
+            p.error(f"--cpu-affinity: {e}")
+        logger.info("Pinned driver process to CPUs %s", sorted(cpus))
 
     total_records = int(args.duration * args.rows_per_second)
     if total_records <= 0:
@@ -101,6 +136,8 @@ async def main_async() -> None:
         duplicate_ratio=args.duplicate_ratio,
         shutdown_event=shutdown_event,
         pgbouncer_enabled=pgbouncer_enabled,
+        fused_queries=args.fused_queries,
+        bulk=args.bulk,
     )
     logger.info("Run finished.")
 
@@ -9,7 +9,10 @@ Requires Linux (/proc, /sys). Use --block and --net to filter devices; use --no-
 from __future__ import annotations
 
 import argparse
+import functools
+import itertools
 import os
+import sys
 import time
 from pathlib import Path
 
@@ -23,15 +26,24 @@ def human_bytes(n: int | float) -> str:
     return f"{n:.1f}PiB"
 
 
+# (divisor, suffix) indexed by int(n).bit_length(), so human_*_short do one lookup and one divide instead of a
+# divide-and-compare loop. The 65 entries cover u64 kernel counters; larger values (rates, sums) clamp to the last
+# entry, which keeps the largest unit as the old loop did.
+_SHORT_UNITS = ("B", "K", "M", "G", "T", "P")
+_BYTES_SCALE = tuple(
+    (1 << (10 * i), _SHORT_UNITS[i]) for i in (min(max(bits - 1, 0) // 10, 5) for bits in range(65))
+)
+_RATE_SCALE = tuple(
+    (1 << (10 * i), _SHORT_UNITS[i]) for i in (min(max(bits - 1, 0) // 10, 3) for bits in range(65))
+)
+
+
 def human_bytes_short(n: int | float) -> str:
     """Short units: B, K, M, G, T. Number part formatted as NUM_FMT for alignment."""
     if n < 0:
         n = 0
-    for u in ("B", "K", "M", "G", "T"):
-        if n < 1024:
-            return f"{n:{NUM_FMT}}{u}"
-        n /= 1024
-    return f"{n:{NUM_FMT}}P"
+    divisor, unit = _BYTES_SCALE[min(int(n).bit_length(), len(_BYTES_SCALE) - 1)]
+    return NUM_UNIT_CELL % (n / divisor, unit)
 
 
 def human_rate(n: float, unit: str = "B") -> str:
@@ -48,16 +60,14 @@ def human_rate_short(n: float) -> str:
     """Short units for rate: B, K, M, G (per second). Number part as NUM_FMT."""
     if n < 0:
         n = 0
-    for u in ("B", "K", "M", "G"):
-        if n < 1024:
-            return f"{n:{NUM_FMT}}{u}"
-        n /= 1024
-    return f"{n:{NUM_FMT}}G"
+    divisor, unit = _RATE_SCALE[min(int(n).bit_length(), len(_RATE_SCALE) - 1)]
+    return NUM_UNIT_CELL % (n / divisor, unit)
 
 
 # Box-drawing: major block separator, minor (sub-category) separator
 SEP_MAJOR = " │ "
 SEP_MINOR = " ┆ "
+SEP_MINOR_LEN = len(SEP_MINOR)
 # Header rules: thick before/after header block, thin between main and sub header
 LINE_THICK = "="
 LINE_THIN = "-"
@@ -65,6 +75,21 @@ LINE_THIN = "-"
 # Fixed numeric format: 3 digits before decimal, 1 after (e.g. "  0.1") for alignment
 NUM_FMT = "6.1f"  # total width 6, 1 decimal
 NUM_WIDTH = 6  # pad placeholders to this width
+CPU_CORES_FMT = "6.3f"  # 00.000 cores
+# %-style templates built once from the specs above: printf formatting skips the f-string format-spec parse
+# and is about twice as fast per cell. Placeholders are padded once here too.
+NUM_CELL = "%" + NUM_FMT
+NUM_UNIT_CELL = NUM_CELL + "%s"
+CPU_CORES_CELL = "%" + CPU_CORES_FMT
+NA_CELL = "-".rjust(NUM_WIDTH)
+MAX_CELL = "max".rjust(NUM_WIDTH)
+
+# Sub-header names per group kind; each tick only produces the value lists that go under them.
+DATETIME_SUBS = ("date", "time")
+CPU_SUBS = ("tot", "cpu", "usr", "sys")
+MEM_SUBS = ("tot", "vsz", "rss")
+DISK_SUBS = ("rIOPS", "wIOPS", "r/s", "w/s", "used", "free", "tot")
+NET_SUBS = ("in", "out")
 
 
 def read_one(path: Path, default: str = "") -> str:
@@ -81,20 +106,52 @@ def read_int(path: Path, default: int = 0) -> int:
         return default
 
 
+# Files sampled every tick stay open; procfs/cgroupfs regenerate the content on each read from offset 0,
+# so a pread on the held fd replaces open + fstat + read + close.
+_TICK_FDS: dict[str, int] = {}
+_TICK_READ_SIZE = 65536
+
+
+def read_tick(path: Path | str) -> str:
+    """Read a /proc or cgroup file that is polled every tick through a cached fd. Raises OSError like read_text()."""
+    key = str(path)
+    fd = _TICK_FDS.get(key)
+    if fd is None:
+        fd = os.open(key, os.O_RDONLY | os.O_CLOEXEC)
+        _TICK_FDS[key] = fd
+    try:
+        data = os.pread(fd, _TICK_READ_SIZE, 0)
+        if len(data) == _TICK_READ_SIZE:  # larger than one read: keep going until EOF
+            chunks = [data]
+            offset = len(data)
+            while chunk := os.pread(fd, _TICK_READ_SIZE, offset):
+                chunks.append(chunk)
+                offset += len(chunk)
+            data = b"".join(chunks)
+    except OSError:
+        # e.g. the cgroup went away: drop the fd so the next tick reopens (or fails) cleanly
+        del _TICK_FDS[key]
+        os.close(fd)
+        raise
+    return data.decode()
+
+
 # ---------------------------------------------------------------------------
 # Cgroup detection (v1 and v2)
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=None)
 def find_cgroup_root() -> Path | None:
-    """Unified cgroup v2 root. Returns None if only v1 is available."""
+    """Unified cgroup v2 root. Returns None if only v1 is available. Cached like get_cgroup_v1_controller_root."""
     root = Path("/sys/fs/cgroup")
     if (root / "cgroup.controllers").exists():
         return root
     return None
 
 
+@functools.lru_cache(maxsize=None)
 def get_cgroup_v1_controller_root(controller: str) -> Path | None:
-    """Path to cgroup v1 controller root, e.g. /sys/fs/cgroup/memory."""
+    """Path to cgroup v1 controller root, e.g. /sys/fs/cgroup/memory. Cached: probed once, not every tick."""
     p = Path("/sys/fs/cgroup") / controller
     return p if p.exists() else None
 
@@ -126,11 +183,13 @@ def get_cgroup_path_from_proc(pid: int = 1) -> tuple[Path | None, str | None]:
     Returns (cgroup_root, rel_path): for v2 root is /sys/fs/cgroup and rel from '0::/path';
     for v1-only root is None and rel is the memory controller path. Use PID 1 so we see
     the real container cgroup in privileged containers where /sys/fs/cgroup is the host."""
-    proc_cgroup = Path(f"/proc/{pid}/cgroup")
-    if not proc_cgroup.exists():
-        proc_cgroup = Path("/proc/self/cgroup")
     try:
-        content = proc_cgroup.read_text()
+        content = Path(f"/proc/{pid}/cgroup").read_text()
+    except FileNotFoundError:
+        try:
+            content = Path("/proc/self/cgroup").read_text()
+        except OSError:
+            return (None, None)
     except OSError:
         return (None, None)
     v2_path, v1_memory_path = _parse_proc_cgroup(content)
@@ -152,7 +211,9 @@ def get_cgroup_path_from_sys(cgroup_root: Path | None, mem_root: Path | None) ->
     return None
 
 
+@functools.lru_cache(maxsize=None)
 def _join_cgroup(root: Path, rel: str, *suffix: str) -> Path:
+    """root / rel / suffix... Cached: the per-tick readers ask for the same few files every time."""
     p = root
     for part in (rel or "").strip("/").split("/"):
         if part:
@@ -202,8 +263,7 @@ def parse_proc_stat_cpu(line: str) -> tuple[float, float, float] | None:
 def get_cpu_stats(n_cpus: int) -> tuple[float, float, float]:
     """Return (usr_cores, sys_cores, idl_cores) from /proc/stat."""
     try:
-        with open("/proc/stat") as f:
-            first = f.readline()
+        first = read_tick("/proc/stat").partition("\n")[0]
     except OSError:
         return (0.0, 0.0, float(n_cpus))
     parsed = parse_proc_stat_cpu(first)
@@ -226,33 +286,42 @@ def get_cgroup_cpu_raw(cgroup_root: Path | None, rel: str) -> tuple[int, int] |
     if cgroup_root is None:
         return None
     p = _join_cgroup(cgroup_root, rel, "cpu.stat")
-    if not p.exists():
-        return None
     try:
-        data = p.read_text()
-    except OSError:
+        data = read_tick(p)
+    except OSError:  # includes a missing cpu.stat
         return None
-    user_usec = sys_usec = None
-    for line in data.splitlines():
-        if line.startswith("user_usec "):
-            user_usec = int(line.split()[1])
-        elif line.startswith("system_usec "):
-            sys_usec = int(line.split()[1])
+    user_usec = _stat_field(data, "user_usec")
+    sys_usec = _stat_field(data, "system_usec")
     if user_usec is None or sys_usec is None:
         return None
     return (user_usec, sys_usec)
 
 
+def _stat_field(data: str, key: str) -> int | None:
+    """Value of the 'key value' line in a flat-keyed stat file, located with str.find (no per-line split)."""
+    prefix = key + " "
+    if data.startswith(prefix):
+        start = len(prefix)
+    else:
+        start = data.find("\n" + prefix)
+        if start < 0:
+            return None
+        start += len(prefix) + 1
+    end = data.find("\n", start)
+    try:
+        return int(data[start:end if end >= 0 else None])
+    except ValueError:
+        return None
+
+
 def get_cgroup_cpu_max_cores(cgroup_root: Path | None, rel: str) -> float | None:
     """Max CPU bandwidth in cores from cgroup v2 cpu.max (quota/period). None if unlimited or unavailable."""
     rel = rel or ""
     if cgroup_root is None:
         return None
     p = _join_cgroup(cgroup_root, rel, "cpu.max")
-    if not p.exists():
-        return None
     try:
-        raw = p.read_text().strip().split()
+        raw = read_tick(p).strip().split()
         if len(raw) < 2 or raw[0] == "max":
             return None
         quota = int(raw[0])
@@ -265,11 +334,12 @@ def get_cgroup_cpu_max_cores(cgroup_root: Path | None, rel: str) -> float | None
 
 
 def get_cgroup_cpu_usr_sys_cores_from_deltas(
-    delta_user_usec: int, delta_system_usec: int
+    delta_user_usec: int, delta_system_usec: int, elapsed_sec: float = 1.0
 ) -> tuple[float, float]:
-    """(usr_cores, sys_cores) from usec deltas over 1 second (USEC_PER_SEC usec)."""
-    usr_cores = delta_user_usec / USEC_PER_SEC
-    sys_cores = delta_system_usec / USEC_PER_SEC
+    """(usr_cores, sys_cores) from usec deltas over elapsed_sec seconds."""
+    window_usec = USEC_PER_SEC * elapsed_sec
+    usr_cores = delta_user_usec / window_usec
+    sys_cores = delta_system_usec / window_usec
     return (usr_cores, sys_cores)
 
 
@@ -277,112 +347,77 @@ def get_cgroup_cpu_usr_sys_cores_from_deltas(
 # Memory: total, free (host or cgroup); vsz, rss from meminfo (host) or memory.stat (cgroup)
 # ---------------------------------------------------------------------------
 
+def _meminfo_kb(data: str, key: str) -> int:
+    """Value in kB of the 'Key:   value kB' line of /proc/meminfo, located with str.find; 0 if missing."""
+    prefix = key + ":"
+    if data.startswith(prefix):
+        start = len(prefix)
+    else:
+        start = data.find("\n" + prefix)
+        if start < 0:
+            return 0
+        start += len(prefix) + 1
+    end = data.find("\n", start)
+    fields = data[start:end if end >= 0 else None].split()
+    try:
+        return int(fields[0])
+    except (IndexError, ValueError):
+        return 0
+
+
 def get_meminfo() -> tuple[int, int]:  # total, free (bytes)
-    total = free = 0
     try:
-        with open("/proc/meminfo") as f:
-            for line in f:
-                if line.startswith("MemTotal:"):
-                    total = int(line.split()[1]) * 1024
-                elif line.startswith("MemFree:"):
-                    free = int(line.split()[1]) * 1024
-                if total and free:
-                    break
+        data = read_tick("/proc/meminfo")
     except OSError:
-        pass
-    return total, free
+        return 0, 0
+    return _meminfo_kb(data, "MemTotal") * 1024, _meminfo_kb(data, "MemFree") * 1024
 
 
-def get_cgroup_memory(cgroup_root: Path | None, rel: str) -> tuple[int, int | None] | None:
-    """(current_bytes, max_bytes or None if max). Prefer cgroup v2, fallback to v1."""
-    # Cgroup v2
-    if cgroup_root is not None:
-        cur_path = _join_cgroup(cgroup_root, rel, "memory.current")
-        max_path = _join_cgroup(cgroup_root, rel, "memory.max")
-        if cur_path.exists():
-            try:
-                cur = int(cur_path.read_text().strip())
-            except (OSError, ValueError):
-                return None
-            try:
-                raw = max_path.read_text().strip()
-                if raw == "max":
-                    return (cur, None)
-                return (cur, int(raw))
-            except (OSError, ValueError):
-                return (cur, None)
-    # Cgroup v1
-    mem_root = get_cgroup_v1_controller_root("memory")
-    if not mem_root:
-        return None
-    cur_path_v1 = _join_cgroup(mem_root, rel, "memory.usage_in_bytes")
-    max_path_v1 = _join_cgroup(mem_root, rel, "memory.limit_in_bytes")
+def _parse_memory_stat(data: str, use_rss: bool = False) -> tuple[int, int]:
+    """Parse memory.stat text; return (anon_or_rss, inactive_file). use_rss=True for v1 (rss not anon).
+    Only the two fields are looked up (_stat_field), instead of splitting all 40-odd lines."""
+    anon = _stat_field(data, "rss" if use_rss else "anon")
+    inactive_file = _stat_field(data, "inactive_file")
+    return (anon or 0, inactive_file or 0)
+
+
+def _read_cgroup_memory_files(
+    root: Path, rel: str, current_name: str, limit_name: str, use_rss: bool
+) -> tuple[int, int | None, int | None, int] | None:
+    """(current, limit or None, vsz or None, rss) from one cgroup version's usage, limit and memory.stat files.
+    None when the usage file is unreadable (controller not present in this version)."""
     try:
-        cur = int(cur_path_v1.read_text().strip())
-    except (OSError, ValueError):
+        current = int(read_tick(_join_cgroup(root, rel, current_name)).strip())
+    except (OSError, ValueError):  # includes a missing file: caller tries the other version
         return None
     try:
-        max_val = int(max_path_v1.read_text().strip())
-        return (cur, max_val if max_val < 2**63 else None)  # v1 uses huge value for "unlimited"
+        raw = read_tick(_join_cgroup(root, rel, limit_name)).strip()
+        limit = None if raw == "max" else int(raw)
     except (OSError, ValueError):
-        return (cur, None)
-
-
-def get_cgroup_memory_stat_rss(cgroup_root: Path | None, rel: str) -> int:
-    """RSS from memory.stat (v2 anon or v1 rss)."""
-    v, r = get_cgroup_memory_vsz_rss(cgroup_root, rel)
-    return r
-
-
-def _parse_memory_stat(data: str, use_rss: bool = False) -> tuple[int, int]:
-    """Parse memory.stat text; return (anon_or_rss, inactive_file). use_rss=True for v1 (rss not anon)."""
-    anon = inactive_file = 0
-    for line in data.splitlines():
-        parts = line.split()
-        if len(parts) < 2:
-            continue
-        if parts[0] == "anon":
-            anon = int(parts[1])
-        elif use_rss and parts[0] == "rss":
-            anon = int(parts[1])
-        elif parts[0] == "inactive_file":
-            inactive_file = int(parts[1])
-    return (anon, inactive_file)
+        limit = None
+    try:
+        data = read_tick(_join_cgroup(root, rel, "memory.stat"))
+    except OSError:
+        return (current, limit, None, 0)
+    anon, inactive_file = _parse_memory_stat(data, use_rss=use_rss)
+    return (current, limit, max(0, current - inactive_file), anon)
 
 
-def get_cgroup_memory_vsz_rss(cgroup_root: Path | None, rel: str) -> tuple[int | None, int]:
-    """(vsz, rss) from cgroup. vsz = memory.current - inactive_file; rss from anon (v2) or rss (v1)."""
+def get_cgroup_memory(cgroup_root: Path | None, rel: str) -> tuple[int, int | None, int | None, int] | None:
+    """(current_bytes, max_bytes or None if max, vsz or None, rss) with each file read once. Prefer cgroup v2,
+    fallback to v1. vsz = current - inactive_file; rss from anon (v2) or rss (v1)."""
     rel = rel or ""
-    # v2: memory.current and memory.stat (anon, inactive_file)
     if cgroup_root is not None:
-        cur_path = _join_cgroup(cgroup_root, rel, "memory.current")
-        stat_path = _join_cgroup(cgroup_root, rel, "memory.stat")
-        if cur_path.exists() and stat_path.exists():
-            try:
-                current = int(cur_path.read_text().strip())
-                data = stat_path.read_text()
-            except (OSError, ValueError):
-                pass
-            else:
-                anon, inactive_file = _parse_memory_stat(data, use_rss=False)
-                vsz = max(0, current - inactive_file)
-                return (vsz, anon)
-    # v1: memory.usage_in_bytes and memory.stat
+        snap = _read_cgroup_memory_files(cgroup_root, rel, "memory.current", "memory.max", use_rss=False)
+        if snap is not None:
+            return snap
     mem_root = get_cgroup_v1_controller_root("memory")
-    if mem_root:
-        cur_path = _join_cgroup(mem_root, rel, "memory.usage_in_bytes")
-        stat_path = _join_cgroup(mem_root, rel, "memory.stat")
-        if cur_path.exists() and stat_path.exists():
-            try:
-                current = int(cur_path.read_text().strip())
-                data = stat_path.read_text()
-            except (OSError, ValueError):
-                pass
-            else:
-                anon, inactive_file = _parse_memory_stat(data, use_rss=True)
-                vsz = max(0, current - inactive_file)
-                return (vsz, anon)
-    return (None, 0)
+    if not mem_root:
+        return None
+    snap = _read_cgroup_memory_files(mem_root, rel, "memory.usage_in_bytes", "memory.limit_in_bytes", use_rss=True)
+    if snap is not None and snap[1] is not None and snap[1] >= 2**63:
+        snap = (snap[0], None, snap[2], snap[3])  # v1 uses huge value for "unlimited"
+    return snap
 
 
 # ---------------------------------------------------------------------------
@@ -393,8 +428,9 @@ def parse_diskstats(content: str) -> dict[str, tuple[int, int, int, int]]:
     """name -> (read_ios, read_sectors, write_ios, write_sectors)."""
     result: dict[str, tuple[int, int, int, int]] = {}
     for line in content.splitlines():
-        parts = line.split()
-        if len(parts) < 14:
+        # Fields past write_sectors are never used: stop splitting there (the tail stays one string).
+        parts = line.split(None, 10)
+        if len(parts) < 11:
             continue
         name = parts[2]
         # skip partition names if we only want whole disks (optional)
@@ -416,78 +452,133 @@ def _read_dev_t(path: Path) -> int | None:
         return None
 
 
+# (/proc/mounts content, st_dev -> mount point) from the last tick; mount points are only re-stat'ed when it changes.
+_MOUNTS_CACHE: tuple[str, dict[int, str]] | None = None
+
+
+@functools.lru_cache(maxsize=None)
+def _nodev_filesystems() -> frozenset[str]:
+    """Filesystem types /proc/filesystems marks 'nodev' (tmpfs, proc, overlay, fuse, cgroup, ...): never backed by
+    a block device."""
+    try:
+        content = Path("/proc/filesystems").read_text()
+    except OSError:
+        return frozenset()
+    return frozenset(
+        parts[1] for parts in (line.split() for line in content.splitlines()) if len(parts) == 2 and parts[0] == "nodev"
+    )
+
+
+def _mount_points_by_dev() -> dict[int, str]:
+    """st_dev -> mount point from /proc/mounts (the last mount of a device wins). Bind mounts and repeats of the
+    same device collapse to one entry, so callers statvfs each device once. Mounts of nodev filesystems are
+    skipped before any stat: they cannot match a /sys/block device, and stat on a dead FUSE mount can hang."""
+    global _MOUNTS_CACHE
+    try:
+        content = read_tick("/proc/mounts")
+    except OSError:
+        return {}
+    if _MOUNTS_CACHE is not None and _MOUNTS_CACHE[0] == content:
+        return _MOUNTS_CACHE[1]
+    nodev = _nodev_filesystems()
+    by_dev: dict[int, str] = {}
+    for line in content.splitlines():
+        parts = line.split()
+        if len(parts) < 3 or parts[2] in nodev:
+            continue
+        try:
+            by_dev[os.stat(parts[1]).st_dev] = parts[1]
+        except OSError:
+            pass
+    _MOUNTS_CACHE = (content, by_dev)
+    return by_dev
+
+
+# (monotonic time of the scan, topology) for the last /sys/block walk; see _block_topology.
+_BLOCK_TOPOLOGY: tuple[float, list[tuple[str, int, int | None, tuple[int, ...]]]] | None = None
+_BLOCK_TOPOLOGY_TTL_SEC = 30.0
+
+
+def _block_topology() -> list[tuple[str, int, int | None, tuple[int, ...]]]:
+    """(name, total_bytes, whole-disk dev_t|None, partition dev_ts) for each non-loop device in /sys/block, sorted.
+    Devices, partitions and sizes change far less often than the monitor ticks, so the walk is redone at most
+    every _BLOCK_TOPOLOGY_TTL_SEC."""
+    global _BLOCK_TOPOLOGY
+    now = time.monotonic()
+    if _BLOCK_TOPOLOGY is not None and now - _BLOCK_TOPOLOGY[0] < _BLOCK_TOPOLOGY_TTL_SEC:
+        return _BLOCK_TOPOLOGY[1]
+    topology: list[tuple[str, int, int | None, tuple[int, ...]]] = []
+    try:
+        with os.scandir("/sys/block") as it:
+            dev_entries = sorted((e.name, e.path) for e in it if not e.name.startswith("loop"))
+    except OSError:
+        dev_entries = []
+    for name, dev_dir in dev_entries:
+        try:
+            sectors = int(Path(dev_dir, "size").read_text().strip())
+        except (OSError, ValueError):
+            continue
+        # Whole-disk device number (e.g. /sys/block/sda/dev) and its partitions' (e.g. /sys/block/sda/sda1/dev).
+        # Partitions are real subdirectories; symlinks (device, bdi, subsystem) are skipped using the dirent type.
+        part_devs: list[int] = []
+        try:
+            with os.scandir(dev_dir) as it:
+                part_dirs = [e.path for e in it if e.name != name and e.is_dir(follow_symlinks=False)]
+        except OSError:
+            part_dirs = []
+        for part_dir in part_dirs:
+            part_dev = _read_dev_t(Path(part_dir, "dev"))
+            if part_dev is not None:
+                part_devs.append(part_dev)
+        topology.append((name, sectors * 512, _read_dev_t(Path(dev_dir, "dev")), tuple(part_devs)))
+    _BLOCK_TOPOLOGY = (now, topology)
+    return topology
+
+
 def get_block_device_sizes(
     block_filter: list[str] | None,
     block_exclude: list[str] | None = None,
 ) -> list[tuple[str, int, int | None, int | None]]:
     """(name, total_bytes, used_bytes|None, free_bytes|None). Used/free from mounts by device number."""
     result: list[tuple[str, int, int | None, int | None]] = []
-    sys_block = Path("/sys/block")
-    if not sys_block.exists():
+    topology = _block_topology()
+    if not topology:
         return result
 
-    # Build map: device number (st_dev) -> (used, free) from each mount point
+    # Build map: device number (st_dev) -> (used, free), one statvfs per device
     dev_usage: dict[int, tuple[int, int]] = {}
-    try:
-        with open("/proc/mounts") as f:
-            for line in f:
-                parts = line.split()
-                if len(parts) < 2:
-                    continue
-                mount_point = parts[1]
-                try:
-                    st_dev = os.stat(mount_point).st_dev
-                    stat = os.statvfs(mount_point)
-                    total = stat.f_blocks * stat.f_frsize
-                    free = stat.f_bavail * stat.f_frsize
-                    used = total - free
-                    dev_usage[st_dev] = (used, free)
-                except OSError:
-                    pass
-    except OSError:
-        pass
-
-    for dev_dir in sorted(sys_block.iterdir()):
-        if dev_dir.name.startswith("loop"):
+    for st_dev, mount_point in _mount_points_by_dev().items():
+        try:
+            stat = os.statvfs(mount_point)
+        except OSError:
             continue
-        name = dev_dir.name
+        total = stat.f_blocks * stat.f_frsize
+        free = stat.f_bavail * stat.f_frsize
+        used = total - free
+        dev_usage[st_dev] = (used, free)
+
+    for name, total_bytes, dev_t, part_devs in topology:
         if block_filter is not None and name not in block_filter:
             continue
         if block_exclude and name in block_exclude:
             continue
-        size_path = dev_dir / "size"
-        try:
-            sectors = int(size_path.read_text().strip())
-        except (OSError, ValueError):
+        if dev_t is not None and dev_t in dev_usage:
+            used, free = dev_usage[dev_t]
+            result.append((name, total_bytes, used, free))
             continue
-        total_bytes = sectors * 512
+        # Partitions aggregate to this disk
         used_sum = free_sum = 0
         found = False
-
-        # Whole-disk device number (e.g. /sys/block/sda/dev)
-        dev_path = dev_dir / "dev"
-        if dev_path.exists():
-            dev_t = _read_dev_t(dev_path)
-            if dev_t is not None and dev_t in dev_usage:
-                u, f = dev_usage[dev_t]
-                used_sum, free_sum, found = u, f, True
-
-        # Partitions (e.g. /sys/block/sda/sda1/dev) – aggregate to this disk
-        if not found:
-            for part_path in dev_dir.iterdir():
-                if part_path.name == name or not part_path.is_dir():
-                    continue
-                part_dev = part_path / "dev"
-                if part_dev.exists():
-                    dev_t = _read_dev_t(part_dev)
-                    if dev_t is not None and dev_t in dev_usage:
-                        u, f = dev_usage[dev_t]
-                        used_sum += u
-                        free_sum += f
-                        found = True
-
-        used = (used_sum, free_sum) if found else (None, None)
-        result.append((name, total_bytes, used[0], used[1]))
+        for part_dev in part_devs:
+            if part_dev in dev_usage:
+                u, f = dev_usage[part_dev]
+                used_sum += u
+                free_sum += f
+                found = True
+        if found:
+            result.append((name, total_bytes, used_sum, free_sum))
+        else:
+            result.append((name, total_bytes, None, None))
     return result
 
 
@@ -573,23 +664,40 @@ def print_metrics_sources_summary(
 # Main output
 # ---------------------------------------------------------------------------
 
-def sample_disk_net() -> tuple[dict, dict, dict, dict]:
+def sample_counters(
+    cgroup_root: Path | None, cgroup_rel: str | None, in_cgroup: bool
+) -> tuple[float, dict, dict, tuple[int, int] | None]:
+    """One read of the cumulative counters: (monotonic time, diskstats, net/dev, cgroup cpu usec or None).
+    Each tick diffs against the previous tick's sample, so the time between ticks is the rate window."""
     try:
-        d1 = Path("/proc/diskstats").read_text()
-        n1 = Path("/proc/net/dev").read_text()
+        disk = parse_diskstats(read_tick("/proc/diskstats"))
     except OSError:
-        return {}, {}, {}, {}
-    time.sleep(1)
+        disk = {}
     try:
-        d2 = Path("/proc/diskstats").read_text()
-        n2 = Path("/proc/net/dev").read_text()
+        net = parse_net_dev(read_tick("/proc/net/dev"))
     except OSError:
-        return parse_diskstats(d1), parse_diskstats(d2), parse_net_dev(n1), parse_net_dev(n2)
-    a = parse_diskstats(d1)
-    b = parse_diskstats(d2)
-    na = parse_net_dev(n1)
-    nb = parse_net_dev(n2)
-    return a, b, na, nb
+        net = {}
+    cg_cpu = get_cgroup_cpu_raw(cgroup_root, cgroup_rel or "") if in_cgroup else None
+    return time.monotonic(), disk, net, cg_cpu
+
+
+def _stdout_is_devnull() -> bool:
+    """True when stdout is /dev/null (e.g. a sidecar started with >/dev/null), so nothing rendered would be seen."""
+    try:
+        return os.path.samestat(os.fstat(sys.stdout.fileno()), os.stat(os.devnull))
+    except (AttributeError, OSError, ValueError):  # no stdout, or not backed by an fd
+        return False
+
+
+def _sleep_until_next_tick(next_tick: float, interval: float) -> float:
+    """Sleep until the next monotonic deadline and return it. When behind (e.g. a slow statvfs), resume from now
+    rather than printing a burst of rows."""
+    next_tick += interval
+    now_mono = time.monotonic()
+    if next_tick > now_mono:
+        time.sleep(next_tick - now_mono)
+        return next_tick
+    return now_mono
 
 
 def main() -> None:
@@ -611,6 +719,9 @@ def main() -> None:
     block_exclude: list[str] | None = [x.strip() for x in args.no_block.split(",")] if args.no_block else None
     net_filter: list[str] | None = [x.strip() for x in args.net.split(",")] if args.net else None
 
+    # Output is discarded (stdout is /dev/null): keep sampling every tick, but skip formatting and the write.
+    discard_output = _stdout_is_devnull()
+
     # Prefer cgroup path from /proc/1/cgroup so we read the real container cgroup in privileged containers
     cgroup_root, cgroup_rel = get_cgroup_path_from_proc(1)
     if cgroup_rel is None:
@@ -621,6 +732,13 @@ def main() -> None:
     first_line = True
     saved_widths: list[int] = []
     data_row_count = 0
+    row_fmt_key: tuple | None = None
+    row_fmt = ""
+    cached_header_key: tuple | None = None
+    cached_layout: tuple | None = None
+    subs_flat: list[str] = []
+    col_seps: list[str] = []
+    cached_header_block = ""
 
     if args.debug:
         print_metrics_sources_summary(
@@ -636,30 +754,34 @@ def main() -> None:
             net_filter=net_filter,
         )
 
+    # Block IO, net and cgroup CPU are cumulative counters: each tick reads them once and diffs against the
+    # previous tick, so rates cover the whole interval. The first row needs a baseline taken 1s earlier.
+    n_cpus = get_n_cpus()  # fixed for the life of the process
+    prev_sample = sample_counters(cgroup_root, cgroup_rel, in_cgroup)
+    time.sleep(1)
+    # Rows are scheduled on a monotonic deadline so sampling/render time does not accumulate into drift.
+    next_tick = time.monotonic()
     while True:
-        # Cgroup CPU: sample before and after 1s so usr/sys cores from usec deltas
-        before_cg = get_cgroup_cpu_raw(cgroup_root, cgroup_rel or "") if in_cgroup else None
-
-        # Block IO and net (1s sample); also provides the 1s window for cgroup CPU deltas
-        d1, d2, n1, n2 = sample_disk_net()
+        sample = sample_counters(cgroup_root, cgroup_rel, in_cgroup)
+        t1, d1, n1, before_cg = prev_sample
+        t2, d2, n2, after_cg = sample
+        prev_sample = sample
+        elapsed = max(t2 - t1, 1e-3)
 
-        n_cpus = get_n_cpus()
         # CPU: from cgroup deltas (cores) or from host /proc/stat (cores)
         cpu_src = None
         cg_max_cores: float | None = None
         if in_cgroup and before_cg:
-            after_cg = get_cgroup_cpu_raw(cgroup_root, cgroup_rel or "")
             if after_cg:
                 du = after_cg[0] - before_cg[0]
                 ds = after_cg[1] - before_cg[1]
-                usr_cores, sys_cores = get_cgroup_cpu_usr_sys_cores_from_deltas(du, ds)
+                usr_cores, sys_cores = get_cgroup_cpu_usr_sys_cores_from_deltas(du, ds, elapsed)
                 cg_max_cores = get_cgroup_cpu_max_cores(cgroup_root, cgroup_rel or "")
                 cpu_src = "cgroup"
         if cpu_src is None:
             usr_cores, sys_cores, _idl_cores = get_cpu_stats(n_cpus)
             cpu_src = "host"
 
-        CPU_CORES_FMT = "6.3f"  # 00.000 cores
         # Total available CPU: cgroup limit when set, else n_cpus
         cpu_tot_available = cg_max_cores if (cpu_src == "cgroup" and cg_max_cores is not None) else float(n_cpus)
 
@@ -667,12 +789,11 @@ def main() -> None:
         cg_cur = cg_max = None
         mem_total = mem_free = 0  # set for host or cgroup path
         if in_cgroup:
-            cg_vsz, cg_rss = get_cgroup_memory_vsz_rss(cgroup_root, cgroup_rel or "")
-            vsz = cg_vsz  # None when from cgroup (no vsz in memory.stat)
-            rss = cg_rss
             cg = get_cgroup_memory(cgroup_root, cgroup_rel or "")
             if cg:
-                cg_cur, cg_max = cg
+                cg_cur, cg_max, vsz, rss = cg  # vsz None when memory.stat is unreadable
+            else:
+                vsz, rss = None, 0
         else:
             mem_total, mem_free = get_meminfo()
             vsz = mem_total
@@ -686,8 +807,9 @@ def main() -> None:
         else:
             if in_cgroup:
                 mem_total, _ = get_meminfo()
-        mem_tot_str = f"{'max':>{NUM_WIDTH}}" if cg_unlimited else human_bytes_short(mem_total)
-        disk_deltas: dict[str, tuple[int, int, int, int]] = {}
+        mem_tot_str = MAX_CELL if cg_unlimited else human_bytes_short(mem_total)
+        # Per-second rates over the window since the previous tick
+        disk_deltas: dict[str, tuple[float, float, float, float]] = {}
         if d1 and d2:
             for name in d2:
                 if name not in d1:
@@ -699,163 +821,170 @@ def main() -> None:
                 a = d1[name]
                 b = d2[name]
                 disk_deltas[name] = (
-                    b[0] - a[0], b[1] - a[1], b[2] - a[2], b[3] - a[3],
+                    (b[0] - a[0]) / elapsed, (b[1] - a[1]) / elapsed,
+                    (b[2] - a[2]) / elapsed, (b[3] - a[3]) / elapsed,
                 )
-        net_deltas: dict[str, tuple[int, int]] = {}
+        net_deltas: dict[str, tuple[float, float]] = {}
         if n1 and n2:
             for name in n2:
                 if name not in n1 or name == "lo":
                     continue
                 if net_filter is not None and name not in net_filter:
                     continue
-                net_deltas[name] = (n2[name][0] - n1[name][0], n2[name][1] - n1[name][1])
+                net_deltas[name] = ((n2[name][0] - n1[name][0]) / elapsed, (n2[name][1] - n1[name][1]) / elapsed)
 
         # Block device sizes
         block_sizes = get_block_device_sizes(block_filter, block_exclude)
 
-        # Build table: (main_header, [(sub_header, value), ...]) with date/time first
+        if discard_output:
+            if args.interval <= 0:
+                break
+            next_tick = _sleep_until_next_tick(next_tick, args.interval)
+            continue
+
+        # Build table: (main_header, sub_headers, [value, ...]) with date/time first
         now = time.localtime()
         date_str = time.strftime("%Y-%m-%d", now)
         time_str = time.strftime("%H:%M:%S", now)
         pad = "  "  # between columns
 
         mem_src = "cgroup" if cg_cur is not None else "host"
-        groups: list[tuple[str, list[tuple[str, str]]]] = [
-            ("datetime", [("date", date_str), ("time", time_str)]),
+        groups: list[tuple[str, tuple[str, ...], list[str]]] = [
+            ("datetime", DATETIME_SUBS, [date_str, time_str]),
         ]
         if not args.no_cpu:
-            groups.append((f"cpu ({cpu_src})", [
-                ("tot", f"{cpu_tot_available:{CPU_CORES_FMT}}"),
-                ("cpu", f"{usr_cores + sys_cores:{CPU_CORES_FMT}}"),
-                ("usr", f"{usr_cores:{CPU_CORES_FMT}}"),
-                ("sys", f"{sys_cores:{CPU_CORES_FMT}}"),
+            groups.append((f"cpu ({cpu_src})", CPU_SUBS, [
+                CPU_CORES_CELL % cpu_tot_available,
+                CPU_CORES_CELL % (usr_cores + sys_cores),
+                CPU_CORES_CELL % usr_cores,
+                CPU_CORES_CELL % sys_cores,
             ]))
         if not args.no_mem:
-            groups.append((f"mem ({mem_src})", [
-                ("tot", mem_tot_str),
-                ("vsz", human_bytes_short(vsz) if vsz is not None else f"{'-':>{NUM_WIDTH}}"),
-                ("rss", human_bytes_short(rss)),
+            groups.append((f"mem ({mem_src})", MEM_SUBS, [
+                mem_tot_str,
+                human_bytes_short(vsz) if vsz is not None else NA_CELL,
+                human_bytes_short(rss),
             ]))
-        # Per-device disk IO + size: only devices mounted in container (have used/free from a mount)
-        def _io_for_device(dev_name: str) -> tuple[int, int, int, int]:
-            """Use whole-disk stats only (no partition sum). Kernel attributes the same I/O to both
-            disk and partition, so summing disk+partitions would double-count vs dstat/iostat."""
-            if dev_name not in disk_deltas:
-                return (0, 0, 0, 0)
-            return disk_deltas[dev_name]
-
+        # Per-device disk IO + size: only devices mounted in container (have used/free from a mount).
+        # Whole-disk stats only (no partition sum): the kernel attributes the same I/O to both disk and
+        # partition, so summing disk+partitions would double-count vs dstat/iostat.
         if not args.no_disk:
+            no_io = (0, 0, 0, 0)
             for name, total, used, free in block_sizes:
                 if used is None and free is None:
                     continue  # not mounted in container, skip
-                r_ios, r_sec, w_ios, w_sec = _io_for_device(name)
+                r_ios, r_sec, w_ios, w_sec = disk_deltas.get(name, no_io)
                 r_bps = r_sec * 512
                 w_bps = w_sec * 512
-                used_s = human_bytes_short(used) if used is not None else f"{'-':>{NUM_WIDTH}}"
-                free_s = human_bytes_short(free) if free is not None else f"{'-':>{NUM_WIDTH}}"
-                groups.append((f"{name} (host)", [
-                    ("rIOPS", f"{r_ios:{NUM_FMT}}"),
-                    ("wIOPS", f"{w_ios:{NUM_FMT}}"),
-                    ("r/s", human_rate_short(r_bps)),
-                    ("w/s", human_rate_short(w_bps)),
-                    ("used", used_s),
-                    ("free", free_s),
-                    ("tot", human_bytes_short(total)),
+                used_s = human_bytes_short(used) if used is not None else NA_CELL
+                free_s = human_bytes_short(free) if free is not None else NA_CELL
+                groups.append((f"{name} (host)", DISK_SUBS, [
+                    NUM_CELL % r_ios,
+                    NUM_CELL % w_ios,
+                    human_rate_short(r_bps),
+                    human_rate_short(w_bps),
+                    used_s,
+                    free_s,
+                    human_bytes_short(total),
                 ]))
         if not args.no_net:
             for iface in sorted(net_deltas.keys()):
                 rx, tx = net_deltas[iface]
-                groups.append((f"{iface} (host)", [
-                    ("in", human_rate_short(rx)),
-                    ("out", human_rate_short(tx)),
+                groups.append((f"{iface} (host)", NET_SUBS, [
+                    human_rate_short(rx),
+                    human_rate_short(tx),
                 ]))
 
-        # Flatten to columns: (main, sub, value)
-        columns: list[tuple[str, str, str]] = []
-        group_end_indices: set[int] = set()
-        idx = 0
-        for main, subs in groups:
-            for sub, val in subs:
-                columns.append((main, sub, val))
-                idx += 1
-            group_end_indices.add(idx - 1)
+        # Flatten to parallel per-column lists. Sub-headers and group boundaries depend only on the layout (group
+        # names and their sub-header tuples), so they are recomputed only when it changes; values every tick.
+        layout = tuple((main, subs) for main, subs, _vals in groups)
+        if layout != cached_layout:
+            subs_flat = [sub for _main, subs in layout for sub in subs]
+            # Separator after each column but the last: SEP_MAJOR at a group end, SEP_MINOR inside a group
+            col_seps = [SEP_MINOR] * (len(subs_flat) - 1)
+            idx = 0
+            for _main, subs in layout[:-1]:
+                idx += len(subs)
+                col_seps[idx - 1] = SEP_MAJOR
+            cached_layout = layout
+        vals_flat = [val for _main, _subs, vals in groups for val in vals]
+        n_cols = len(subs_flat)
 
         def join_with_seps(cells: list[str], major_between_groups_only: bool = False) -> str:
             """Join cells with SEP_MAJOR between groups, SEP_MINOR within a group.
             If major_between_groups_only is True (main header row), use SEP_MAJOR between every cell."""
-            out = []
-            for i, c in enumerate(cells):
-                out.append(c)
-                if i < len(cells) - 1:
-                    if major_between_groups_only:
-                        out.append(SEP_MAJOR)
-                    else:
-                        out.append(SEP_MAJOR if i in group_end_indices else SEP_MINOR)
+            if not cells:
+                return ""
+            n = len(cells)
+            if major_between_groups_only:
+                seps = [SEP_MAJOR] * (n - 1)
+            else:
+                seps = col_seps[: n - 1]
+            # Interleave into a list of the final size (cell, sep, cell, ..., cell) instead of appending per item
+            out = [""] * (2 * n - 1)
+            out[0::2] = cells
+            out[1::2] = seps
             return "".join(out)
 
         # Column widths from sub-header and value only (main header is centered over group)
         min_w = 5
         if first_line or not saved_widths:
-            widths = [
+            saved_widths = [
                 max(min_w, len(sub), len(val))
-                for _main, sub, val in columns
+                for sub, val in zip(subs_flat, vals_flat)
             ]
-            saved_widths = list(widths)
-        else:
-            widths = saved_widths
-            while len(widths) < len(columns):
-                _main, sub, val = columns[len(widths)]
-                widths.append(max(min_w, len(sub), len(val)))
-                saved_widths.append(widths[-1])
-
-        def rjust(s: str, w: int) -> str:
-            return " " * max(0, w - len(s)) + s
-
-        def center_main(name: str, span: int, widths_slice: list[int]) -> str:
-            # Total width = sum of column widths + (span-1) * len(SEP_MINOR)
-            total_w = sum(widths_slice) + (span - 1) * len(SEP_MINOR)
-            return name.center(max(total_w, len(name)))
-
-        # Repeat header when scrolled (every --repeat-header data lines)
+        elif len(saved_widths) < n_cols:
+            # Columns were added (device/interface appeared): size all the new ones in one extend
+            known = len(saved_widths)
+            saved_widths.extend([
+                max(min_w, len(sub), len(val))
+                for sub, val in zip(subs_flat[known:], vals_flat[known:])
+            ])
+        widths = saved_widths
+        # Widen (never narrow) a column whose value outgrew it, e.g. 999.9G -> 1000.0G, so rows stay aligned; the
+        # new widths key rebuilds the row template and header block, and the header is reprinted to match.
+        widened = False
+        if any(len(val) > w for val, w in zip(vals_flat, widths)):
+            for i, val in enumerate(vals_flat):
+                if len(val) > widths[i]:
+                    widths[i] = len(val)
+            widened = True
+        widths_key = tuple(widths[:n_cols])
+
+        # Header block (rules, group names, sub-headers) on first output, after a column widens and again every
+        # --repeat-header data lines. It is rendered once per layout/widths and reused verbatim until either changes.
         repeat_header = args.repeat_header
-        if repeat_header and data_row_count > 0 and data_row_count % repeat_header == 0:
-            main_parts = []
-            col_idx = 0
-            for main, subs in groups:
-                n = len(subs)
-                w_slice = widths[col_idx : col_idx + n]
-                main_parts.append(center_main(main, n, w_slice))
-                col_idx += n
-            sub_parts = [rjust(sub, widths[i]) for i, (_, sub, _) in enumerate(columns)]
-            header_line = join_with_seps(main_parts, major_between_groups_only=True)
-            w = len(header_line)
-            print(LINE_THICK * w)
-            print(header_line)
-            print(LINE_THIN * w)
-            print(join_with_seps(sub_parts))
-            print(LINE_THICK * w)
-
-        # Print main header row (group names over their columns) on first output
-        if first_line:
-            main_parts = []
-            col_idx = 0
-            for main, subs in groups:
-                n = len(subs)
-                w_slice = widths[col_idx : col_idx + n]
-                main_parts.append(center_main(main, n, w_slice))
-                col_idx += n
-            sub_parts = [rjust(sub, widths[i]) for i, (_, sub, _) in enumerate(columns)]
-            header_line = join_with_seps(main_parts, major_between_groups_only=True)
-            w = len(header_line)
-            print(LINE_THICK * w)
-            print(header_line)
-            print(LINE_THIN * w)
-            print(join_with_seps(sub_parts))
-            print(LINE_THICK * w)
-
-        # Print data row
-        val_parts = [rjust(val, widths[i]) for i, (_, _, val) in enumerate(columns)]
-        print(join_with_seps(val_parts))
+        out = ""  # everything printed this tick, written with one sys.stdout.write
+        if first_line or widened or (repeat_header and data_row_count > 0 and data_row_count % repeat_header == 0):
+            header_key = (layout, widths_key)
+            if header_key != cached_header_key:
+                # Group names are centred over their columns plus the SEP_MINORs between them
+                # (str.center leaves a name wider than that as is).
+                # Prefix sums give each group's column total without slicing and re-summing widths.
+                widths_prefix = list(itertools.accumulate(widths_key, initial=0))
+                main_parts = []
+                col_idx = 0
+                for main, subs in layout:
+                    n = len(subs)
+                    total_w = widths_prefix[col_idx + n] - widths_prefix[col_idx] + (n - 1) * SEP_MINOR_LEN
+                    main_parts.append(main.center(total_w))
+                    col_idx += n
+                sub_parts = [sub.rjust(w) for sub, w in zip(subs_flat, widths)]
+                header_line = join_with_seps(main_parts, major_between_groups_only=True)
+                w = len(header_line)
+                thick = LINE_THICK * w
+                cached_header_block = "\n".join(
+                    (thick, header_line, LINE_THIN * w, join_with_seps(sub_parts), thick)
+                )
+                cached_header_key = header_key
+            out = cached_header_block + "\n"
+
+        # Print data row through a str.format template with the widths and separators baked in; it only changes
+        # when a column is added or the group boundaries move.
+        if (layout, widths_key) != row_fmt_key:
+            row_fmt = join_with_seps(["{:>%d}" % w for w in widths_key])
+            row_fmt_key = (layout, widths_key)
+        sys.stdout.write(out + row_fmt.format(*vals_flat) + "\n")
 
         data_row_count += 1
         if first_line:
@@ -863,8 +992,7 @@ def main() -> None:
 
         if args.interval <= 0:
             break
-        # sample_disk_net() already slept 1s; sleep the remainder so lines print at --interval
-        time.sleep(max(0.0, args.interval - 1.0))
+        next_tick = _sleep_until_next_tick(next_tick, args.interval)
 
 
 if __name__ == "__main__":